@@ -100,7 +100,7 @@ if %INSTALL_STATUS% NEQ 0 (
     echo.
     echo WARNING: Full installation failed. Installing core packages only...
     echo.
-    pip install anthropic openai pyyaml pydantic pillow pystray keyring opencv-python mss pygetwindow pynput imagehash numpy
+    pip install anthropic httpx pyyaml pydantic pillow pystray keyring opencv-python mss pygetwindow pynput numpy
     if errorlevel 1 (
         echo.
         echo ERROR: Failed to install core packages.
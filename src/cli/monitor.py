@@ -4,6 +4,8 @@ import time
 from datetime import datetime
 from typing import Optional
 
+import anthropic
+import httpx
 import numpy as np
 
 from src.lib.config import Config
@@ -106,9 +108,9 @@ class Monitor:
 
         self.is_running = False
 
-        # Stop voice service (interrupt any ongoing speech)
+        # Stop voice service (interrupt any ongoing speech, close connections)
         if hasattr(self, "voice_service"):
-            self.voice_service.stop()
+            self.voice_service.close()
 
         # Stop screen capture
         if hasattr(self, "screen_capture"):
@@ -130,8 +132,9 @@ class Monitor:
                 print(f"Accuracy: {self.session.accuracy_rate * 100:.1f}%")
                 print("=" * 50)
 
-            # Save session
+            # Save session (stops background saving)
             try:
+                self.session_service.close()
                 self.session_service.save_session(self.session)
                 if print_summary:
                     print(f"Session saved: {self.session.id}")
@@ -139,11 +142,19 @@ class Monitor:
                 if print_summary:
                     print(f"Warning: Failed to save session: {e}")
 
-            # Persist cache
-            self.pattern_cache.persist()
+            # Persist cache (stops background saving)
+            self.pattern_cache.close()
             if print_summary:
                 print("Pattern cache saved.")
 
+        # Write any pending corrections/examples
+        if hasattr(self, "learning_service"):
+            try:
+                self.learning_service.close()
+            except Exception as e:
+                if print_summary:
+                    print(f"Warning: Failed to save learning data: {e}")
+
         if print_summary:
             print("\nGoodbye!")
 
@@ -228,12 +239,19 @@ class Monitor:
         self.pattern_cache = PatternCacheService(
             cache_file=str(self.config.cache.pattern_cache_file),
             hamming_threshold=self.config.cache.hamming_threshold,
+            max_size=self.config.cache.max_patterns,
+            autosave_interval=30.0,
+            autosave_every=self.config.cache.persist_interval,
         )
 
+        # Shared Anthropic client for analysis and commentary
+        anthropic_client = self._create_anthropic_client()
+
         # AI analyzer
         self.ai_analyzer = AIAnalyzerService(
             api_key=self.config.anthropic.api_key,
             model=self.config.anthropic.model,
+            client=anthropic_client,
         )
 
         # Commentary generator
@@ -241,6 +259,7 @@ class Monitor:
             api_key=self.config.anthropic.api_key,
             personality_name=self.config.personality,
             model=self.config.anthropic.model,
+            client=anthropic_client,
         )
 
         # Voice service
@@ -269,6 +288,28 @@ class Monitor:
         else:
             print("Screen classifier: no training data found, running without pre-filter.")
 
+    def _create_anthropic_client(self) -> anthropic.Anthropic:
+        """
+        Create the Anthropic client shared by all Claude-backed services.
+
+        Shots arrive tens of seconds apart, well past httpx's default 5s
+        keep-alive, so idle connections are kept open long enough for the
+        next shot to skip the TCP + TLS handshake.
+
+        Returns:
+            Anthropic client with a persistent connection pool
+        """
+        return anthropic.Anthropic(
+            api_key=self.config.anthropic.api_key,
+            http_client=anthropic.DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=8,
+                    max_keepalive_connections=8,
+                    keepalive_expiry=120.0,
+                ),
+            ),
+        )
+
     def _monitoring_loop(self) -> None:
         """
         Main monitoring loop.
@@ -296,8 +337,11 @@ class Monitor:
 
                 # Check if ball stopped (shot complete)
                 if self.motion_detector.is_ball_stopped():
-                    # Process shot
-                    self._process_shot(frame)
+                    # Process shot on a checked copy: the capture ring reuses
+                    # the frame, and copy=True guards against a torn read
+                    shot_frame = self.screen_capture.get_latest_frame(copy=True)
+                    if shot_frame is not None:
+                        self._process_shot(shot_frame)
 
                     # Reset motion detector for next shot
                     self.motion_detector.reset()
@@ -495,7 +539,7 @@ class Monitor:
                 print(f"  Skipping commentary (frequency: {self.config.commentary_frequency})")
 
             # Create shot event
-            screenshot_hash = str(self.pattern_cache._compute_hash(screenshot))
+            screenshot_hash = f"{self.pattern_cache._compute_hash(screenshot):016x}"
             shot_event = ShotEvent(
                 id=shot_id,
                 timestamp=timestamp,
@@ -511,6 +555,7 @@ class Monitor:
             # Add to session
             if self.session:
                 self.session.shot_events.append(shot_event)
+                self.session_service.schedule_save(self.session)
 
                 # Print running stats
                 print(f"  Session stats: {len(self.session.shot_events)} shots, "
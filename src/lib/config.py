@@ -76,6 +76,7 @@ class CacheConfig:
     pattern_cache_file: str = "data/cache/pattern_cache.json"
     hamming_threshold: int = 10
     min_confidence_to_cache: float = 0.7
+    max_patterns: int = 5000
     # Aliases for backward compatibility
     confidence_threshold: float = None
     hamming_distance_max: int = None
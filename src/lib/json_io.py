@@ -0,0 +1,108 @@
+"""Fast JSON encoding and atomic file writes."""
+import json
+import os
+from pathlib import Path
+from typing import Any, List
+
+# Max buffers per writev call (POSIX guarantees at least 16; Linux allows 1024)
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+# orjson is optional: C-speed encoding when installed, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes.
+
+    Args:
+        data: JSON-serializable data
+        indent: Pretty-print with 2-space indentation (default: compact)
+
+    Returns:
+        Encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Deserialize JSON bytes or text.
+
+    Args:
+        data: Encoded JSON
+
+    Returns:
+        Decoded data
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write bytes to a file without ever leaving it half-written.
+
+    Data goes to a sibling temp file first, which then replaces the target.
+
+    Args:
+        path: Destination file
+        data: File contents
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def atomic_write_chunks(path: Path, chunks: List[bytes]) -> None:
+    """
+    Atomically write a file from a list of byte chunks.
+
+    Uses a gathered write (os.writev) where available so the chunks never
+    need to be joined into one buffer; falls back to buffered writes.
+
+    Args:
+        path: Destination file
+        chunks: File contents, in order
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    if not hasattr(os, "writev"):
+        with open(tmp_path, "wb") as f:
+            f.writelines(chunks)
+        os.replace(tmp_path, path)
+        return
+
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        pending = [memoryview(chunk) for chunk in chunks if chunk]
+        while pending:
+            batch = pending[:_IOV_MAX]
+            written = os.writev(fd, batch)
+
+            # Drop fully written buffers; trim a partially written one
+            consumed = 0
+            while consumed < len(batch) and written >= len(batch[consumed]):
+                written -= len(batch[consumed])
+                consumed += 1
+            pending = pending[consumed:]
+            if written:
+                pending[0] = pending[0][written:]
+    finally:
+        os.close(fd)
+
+    os.replace(tmp_path, path)
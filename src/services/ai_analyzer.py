@@ -19,15 +19,21 @@ class AIAnalyzerService:
     vision capabilities with structured output.
     """
 
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-5"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-sonnet-4-5",
+        client: Optional[anthropic.Anthropic] = None,
+    ):
         """
         Initialize AI analyzer.
 
         Args:
             api_key: Anthropic API key
             model: Claude model to use (default: claude-sonnet-4-5)
+            client: Optional shared Anthropic client (reuses its connection pool)
         """
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = client or anthropic.Anthropic(api_key=api_key)
         self.model = model
         self.system_prompt = self._build_system_prompt()
 
@@ -161,8 +167,10 @@ class AIAnalyzerService:
                     "usage": {
                         "input_tokens": message.usage.input_tokens,
                         "output_tokens": message.usage.output_tokens,
-                        "cache_read_input_tokens": getattr(message.usage, 'cache_read_input_tokens', 0),
-                        "cache_creation_input_tokens": getattr(message.usage, 'cache_creation_input_tokens', 0),
+                        # The SDK reports None when caching did not apply; zero reads
+                        # across a session means the cached prefix is too short
+                        "cache_read_input_tokens": getattr(message.usage, 'cache_read_input_tokens', 0) or 0,
+                        "cache_creation_input_tokens": getattr(message.usage, 'cache_creation_input_tokens', 0) or 0,
                     },
                     "content": response_text,
                 }
@@ -274,7 +282,7 @@ class AIAnalyzerService:
             # Name extraction doesn't need high resolution
             from PIL import Image as PILImage
             import cv2
-            name_img = PILImage.fromarray(name_region.astype("uint8"), "RGB")
+            name_img = PILImage.fromarray(name_region.astype(np.uint8, copy=False), "RGB")
             # Resize to max 400x150 - plenty for reading text
             name_img = name_img.resize((min(400, name_img.width), min(150, name_img.height)), PILImage.Resampling.LANCZOS)
             name_region = np.array(name_img)
@@ -352,7 +360,7 @@ class AIAnalyzerService:
 
             # Resize to reduce tokens
             from PIL import Image as PILImage
-            center_img = PILImage.fromarray(center_region.astype("uint8"), "RGB")
+            center_img = PILImage.fromarray(center_region.astype(np.uint8, copy=False), "RGB")
             center_img = center_img.resize((min(600, center_img.width), min(600, center_img.height)), PILImage.Resampling.LANCZOS)
             center_region = np.array(center_img)
 
@@ -428,7 +436,7 @@ class AIAnalyzerService:
         try:
             # Resize screenshot to reduce tokens
             from PIL import Image as PILImage
-            screenshot_img = PILImage.fromarray(screenshot.astype("uint8"), "RGB")
+            screenshot_img = PILImage.fromarray(screenshot.astype(np.uint8, copy=False), "RGB")
             # Resize to max 800x600 for idle detection
             screenshot_img = screenshot_img.resize(
                 (min(800, screenshot_img.width), min(600, screenshot_img.height)),
@@ -572,18 +580,19 @@ Be concise and accurate. Use high confidence (>0.8) only when very certain."""
         Returns:
             User prompt string
         """
-        prompt = "Analyze this GS Pro screenshot and determine the shot outcome.\n\n"
+        parts = ["Analyze this GS Pro screenshot and determine the shot outcome.\n\n"]
 
         if few_shot_examples:
-            prompt += "Here are some reference examples:\n\n"
-            for i, example in enumerate(few_shot_examples, 1):
-                outcome = example.get("outcome", "unknown")
-                reasoning = example.get("reasoning", "")
-                prompt += f"Example {i}:\nOUTCOME: {outcome}\nREASONING: {reasoning}\n\n"
-
-            prompt += "Now analyze the provided screenshot:\n"
+            parts.append("Here are some reference examples:\n\n")
+            parts.extend(
+                f"Example {i}:\n"
+                f"OUTCOME: {example.get('outcome', 'unknown')}\n"
+                f"REASONING: {example.get('reasoning', '')}\n\n"
+                for i, example in enumerate(few_shot_examples, 1)
+            )
+            parts.append("Now analyze the provided screenshot:\n")
 
-        return prompt
+        return "".join(parts)
 
     def _encode_image(self, screenshot: np.ndarray) -> str:
         """
@@ -596,7 +605,7 @@ Be concise and accurate. Use high confidence (>0.8) only when very certain."""
             Base64-encoded JPEG string
         """
         # Convert to PIL Image
-        img = Image.fromarray(screenshot.astype("uint8"), "RGB")
+        img = Image.fromarray(screenshot.astype(np.uint8, copy=False), "RGB")
 
         # Resize more aggressively to save tokens (max 1280x720)
         # Golf shots don't need super high resolution for AI to detect outcomes
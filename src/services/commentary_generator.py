@@ -2,7 +2,8 @@
 import re
 import random
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 
 import anthropic
 import yaml
@@ -10,6 +11,23 @@ import yaml
 from src.lib.exceptions import CommentaryError
 from src.models.outcome import Outcome
 
+# Leading run of exactly two sentences. A sentence ends at one or more of
+# . ! ? followed by whitespace or end of text, so "3.5 yards" stays intact.
+_TWO_SENTENCES = re.compile(r"^(?:.*?[.!?]+(?:\s+|$)){2}", re.DOTALL)
+
+# Default fallback if a personality has no phrases for an outcome
+_FALLBACK_MAP = MappingProxyType({
+    Outcome.FAIRWAY: "Nice shot.",
+    Outcome.GREEN: "On the green.",
+    Outcome.WATER: "That's in the water.",
+    Outcome.BUNKER: "In the bunker.",
+    Outcome.ROUGH: "That's in the rough.",
+    Outcome.TREES: "Hit the trees.",
+    Outcome.OUT_OF_BOUNDS: "Out of bounds.",
+    Outcome.TEE_SHOT: "Ready to tee off.",
+    Outcome.UNKNOWN: "Interesting shot.",
+})
+
 
 class CommentaryGeneratorService:
     """
@@ -25,6 +43,7 @@ class CommentaryGeneratorService:
         personality_name: str = "neutral",
         personalities_dir: str = "data/personalities",
         model: str = "claude-sonnet-4-5",
+        client: Optional[anthropic.Anthropic] = None,
     ):
         """
         Initialize commentary generator.
@@ -34,14 +53,16 @@ class CommentaryGeneratorService:
             personality_name: Name of personality to use (e.g., "neutral", "sarcastic")
             personalities_dir: Directory containing personality YAML files
             model: Claude model to use
+            client: Optional shared Anthropic client (reuses its connection pool)
         """
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = client or anthropic.Anthropic(api_key=api_key)
         self.model = model
         self.personality_name = personality_name
         self.personalities_dir = Path(personalities_dir)
 
         # Load personality configuration
         self.personality_config = self._load_personality(personality_name)
+        self._phrases_by_outcome = self._index_phrases(self.personality_config)
 
     def generate_commentary(
         self,
@@ -65,17 +86,16 @@ class CommentaryGeneratorService:
         Raises:
             CommentaryError: If generation fails
         """
-        try:
-            # Low confidence: use fallback example phrases
-            if confidence < 0.6:
-                return self._generate_fallback_commentary(outcome)
+        # Low confidence: use fallback example phrases (no API call)
+        if confidence < 0.6:
+            return self._generate_fallback_commentary(outcome)
 
+        try:
             # High confidence: use Claude API for dynamic commentary
             system_prompt = self.personality_config.get("system_prompt", "")
-            example_phrases = self.personality_config.get("example_phrases", {})
 
             # Build user prompt
-            user_prompt = self._build_user_prompt(outcome, confidence, context, example_phrases, player_name)
+            user_prompt = self._build_user_prompt(outcome, confidence, context, player_name)
 
             # Call Claude API with prompt caching to reduce costs
             # System prompt is cached across requests
@@ -107,9 +127,9 @@ class CommentaryGeneratorService:
             commentary = self._strip_asterisk_actions(commentary)
 
             # Ensure it's concise (1-2 sentences)
-            sentences = commentary.split(". ")
-            if len(sentences) > 2:
-                commentary = ". ".join(sentences[:2]) + "."
+            match = _TWO_SENTENCES.match(commentary)
+            if match and match.end() < len(commentary):
+                commentary = match.group(0).rstrip()
 
             return commentary
 
@@ -180,9 +200,9 @@ class CommentaryGeneratorService:
             commentary = self._strip_asterisk_actions(commentary)
 
             # Ensure it's concise (1-2 sentences)
-            sentences = commentary.split(". ")
-            if len(sentences) > 2:
-                commentary = ". ".join(sentences[:2]) + "."
+            match = _TWO_SENTENCES.match(commentary)
+            if match and match.end() < len(commentary):
+                commentary = match.group(0).rstrip()
 
             return commentary
 
@@ -253,6 +273,7 @@ class CommentaryGeneratorService:
             CommentaryError: If personality not found
         """
         self.personality_config = self._load_personality(personality_name)
+        self._phrases_by_outcome = self._index_phrases(self.personality_config)
         self.personality_name = personality_name
 
     def _load_personality(self, personality_name: str) -> Dict:
@@ -280,12 +301,32 @@ class CommentaryGeneratorService:
         except Exception as e:
             raise CommentaryError(f"Failed to load personality config: {e}")
 
+    @staticmethod
+    def _index_phrases(config: Dict) -> Dict[Outcome, Tuple[str, ...]]:
+        """
+        Index example phrases by outcome once, at personality load.
+
+        Keys that are not valid outcomes are dropped here so lookups on the
+        commentary path never need to re-validate them.
+
+        Args:
+            config: Personality configuration dict
+
+        Returns:
+            Mapping of outcome to its example phrases
+        """
+        example_phrases = config.get("example_phrases") or {}
+        return {
+            Outcome(key): tuple(phrases)
+            for key, phrases in example_phrases.items()
+            if key in Outcome._value2member_map_ and phrases
+        }
+
     def _build_user_prompt(
         self,
         outcome: Outcome,
         confidence: float,
         context: Optional[Dict],
-        example_phrases: Dict,
         player_name: Optional[str] = None,
     ) -> str:
         """
@@ -295,38 +336,37 @@ class CommentaryGeneratorService:
             outcome: Shot outcome
             confidence: Confidence score
             context: Optional context
-            example_phrases: Example phrases from personality config
             player_name: Optional player name to include
 
         Returns:
             User prompt string
         """
-        prompt = f"Generate commentary for this golf shot:\n\n"
-        prompt += f"OUTCOME: {outcome.value}\n"
-        prompt += f"CONFIDENCE: {confidence:.2f}\n"
+        parts = [
+            "Generate commentary for this golf shot:\n\n",
+            f"OUTCOME: {outcome.value}\n",
+            f"CONFIDENCE: {confidence:.2f}\n",
+        ]
 
         if player_name:
-            prompt += f"PLAYER NAME: {player_name}\n"
+            parts.append(f"PLAYER NAME: {player_name}\n")
 
         if context:
-            prompt += f"CONTEXT: {context}\n"
+            parts.append(f"CONTEXT: {context}\n")
 
         # Add example phrases for this outcome
-        outcome_key = outcome.value
-        if outcome_key in example_phrases:
-            phrases = example_phrases[outcome_key]
-            prompt += f"\nExample phrases for '{outcome_key}':\n"
-            for phrase in phrases[:3]:  # Limit to 3 examples
-                prompt += f"- {phrase}\n"
+        phrases = self._phrases_by_outcome.get(outcome)
+        if phrases:
+            parts.append(f"\nExample phrases for '{outcome.value}':\n")
+            parts.extend(f"- {phrase}\n" for phrase in phrases[:3])  # Limit to 3 examples
 
-        prompt += "\nGenerate a concise (1-2 sentences), personality-appropriate commentary that matches the tone and style of the example phrases."
+        parts.append("\nGenerate a concise (1-2 sentences), personality-appropriate commentary that matches the tone and style of the example phrases.")
 
         if player_name:
-            prompt += f"\nInclude the player's name '{player_name}' naturally in the commentary."
+            parts.append(f"\nInclude the player's name '{player_name}' naturally in the commentary.")
 
-        prompt += "\n\nGenerate authentic commentary that will be spoken aloud via text-to-speech. Match the exact tone, vocabulary, and style shown in the examples above."
+        parts.append("\n\nGenerate authentic commentary that will be spoken aloud via text-to-speech. Match the exact tone, vocabulary, and style shown in the examples above.")
 
-        return prompt
+        return "".join(parts)
 
     def _strip_asterisk_actions(self, text: str) -> str:
         """
@@ -367,29 +407,11 @@ class CommentaryGeneratorService:
         Returns:
             Random example phrase for this outcome
         """
-        example_phrases = self.personality_config.get("example_phrases", {})
-        outcome_key = outcome.value
-
-        # Get phrases for this outcome
-        if outcome_key in example_phrases:
-            phrases = example_phrases[outcome_key]
-            if phrases:
-                return random.choice(phrases)
-
-        # Default fallback if no phrases available
-        fallback_map = {
-            Outcome.FAIRWAY: "Nice shot.",
-            Outcome.GREEN: "On the green.",
-            Outcome.WATER: "That's in the water.",
-            Outcome.BUNKER: "In the bunker.",
-            Outcome.ROUGH: "That's in the rough.",
-            Outcome.TREES: "Hit the trees.",
-            Outcome.OUT_OF_BOUNDS: "Out of bounds.",
-            Outcome.TEE_SHOT: "Ready to tee off.",
-            Outcome.UNKNOWN: "Interesting shot.",
-        }
+        phrases = self._phrases_by_outcome.get(outcome)
+        if phrases:
+            return random.choice(phrases)
 
-        return fallback_map.get(outcome, "Shot detected.")
+        return _FALLBACK_MAP.get(outcome, "Shot detected.")
 
     def estimate_cost(self) -> float:
         """
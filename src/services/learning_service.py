@@ -1,14 +1,21 @@
 """Learning service for managing few-shot examples and user corrections."""
-import json
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import numpy as np
 
+from src.lib import json_io
 from src.lib.exceptions import LearningError
 from src.models.correction import UserCorrection
 from src.models.outcome import Outcome
 
+# Seconds to wait after a change before writing, so bursts coalesce into one write
+_SAVE_DEBOUNCE_SECONDS = 0.5
+
+# Write buffer for the append-only corrections log
+_LOG_BUFFER_SIZE = 64 * 1024
+
 
 class LearningService:
     """
@@ -28,11 +35,14 @@ class LearningService:
         Initialize learning service.
 
         Args:
-            corrections_file: Path to corrections JSON file
+            corrections_file: Path to corrections JSON file. New corrections are
+                appended to a sibling ``.jsonl`` log; an existing JSON file is
+                still read on load.
             examples_file: Path to few-shot examples JSON file
             max_examples_per_outcome: Maximum examples to keep per outcome type
         """
         self.corrections_file = Path(corrections_file)
+        self.corrections_log = self.corrections_file.with_suffix(".jsonl")
         self.examples_file = Path(examples_file)
         self.max_examples_per_outcome = max_examples_per_outcome
 
@@ -44,6 +54,22 @@ class LearningService:
         self.corrections: List[Dict] = self._load_corrections()
         self.few_shot_examples: Dict[str, List[Dict]] = self._load_examples()
 
+        # Corrections grouped by corrected outcome, kept in sync with self.corrections
+        self._corrections_by_outcome: Dict[str, List[Dict]] = {}
+        self._rebuild_corrections_index()
+
+        # Debounced background persistence: mutators mark data dirty and
+        # return; a writer thread saves shortly after (see flush/close)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending_corrections: List[Dict] = []
+        self._corrections_reset = False
+        self._corrections_fp = None
+        self._examples_dirty = False
+        self._save_requested = threading.Event()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
     def add_correction(self, correction: UserCorrection) -> None:
         """
         Record a user correction.
@@ -53,10 +79,15 @@ class LearningService:
         """
         # Convert to dict and append
         correction_data = correction.to_dict()
-        self.corrections.append(correction_data)
+        with self._lock:
+            self.corrections.append(correction_data)
+            self._corrections_by_outcome.setdefault(
+                correction_data["corrected_outcome"], []
+            ).append(correction_data)
+            self._pending_corrections.append(correction_data)
 
-        # Persist
-        self._save_corrections()
+        # Persist (in background)
+        self._schedule_save()
 
     def get_corrections(self) -> List[Dict]:
         """
@@ -77,11 +108,7 @@ class LearningService:
         Returns:
             List of matching corrections
         """
-        return [
-            c
-            for c in self.corrections
-            if c["corrected_outcome"] == str(outcome)
-        ]
+        return list(self._corrections_by_outcome.get(str(outcome), []))
 
     def add_few_shot_example(
         self,
@@ -101,10 +128,6 @@ class LearningService:
         """
         outcome_key = outcome.value
 
-        # Initialize list if not exists
-        if outcome_key not in self.few_shot_examples:
-            self.few_shot_examples[outcome_key] = []
-
         # Add example
         example = {
             "screenshot_hash": screenshot_hash,
@@ -113,17 +136,24 @@ class LearningService:
             "confidence": confidence,
         }
 
-        self.few_shot_examples[outcome_key].append(example)
+        with self._lock:
+            # Initialize list if not exists
+            if outcome_key not in self.few_shot_examples:
+                self.few_shot_examples[outcome_key] = []
+
+            self.few_shot_examples[outcome_key].append(example)
 
-        # Limit to max examples per outcome
-        if len(self.few_shot_examples[outcome_key]) > self.max_examples_per_outcome:
-            # Keep most recent examples
-            self.few_shot_examples[outcome_key] = self.few_shot_examples[outcome_key][
-                -self.max_examples_per_outcome :
-            ]
+            # Limit to max examples per outcome
+            if len(self.few_shot_examples[outcome_key]) > self.max_examples_per_outcome:
+                # Keep most recent examples
+                self.few_shot_examples[outcome_key] = self.few_shot_examples[outcome_key][
+                    -self.max_examples_per_outcome :
+                ]
 
-        # Persist
-        self._save_examples()
+            self._examples_dirty = True
+
+        # Persist (in background)
+        self._schedule_save()
 
     def get_few_shot_examples(
         self, outcome: Optional[Outcome] = None, limit: int = 3
@@ -205,32 +235,161 @@ class LearningService:
 
     def clear_corrections(self) -> None:
         """Clear all corrections (useful for testing or reset)."""
-        self.corrections = []
-        self._save_corrections()
+        with self._lock:
+            self.corrections = []
+            self._rebuild_corrections_index()
+            self._pending_corrections = []
+            self._corrections_reset = True
+        self._schedule_save()
 
     def clear_examples(self) -> None:
         """Clear all few-shot examples (useful for testing or reset)."""
-        self.few_shot_examples = {}
-        self._save_examples()
+        with self._lock:
+            self.few_shot_examples = {}
+            self._examples_dirty = True
+        self._schedule_save()
+
+    def flush(self) -> None:
+        """
+        Write any pending changes to disk now.
+
+        Raises:
+            LearningError: If a file cannot be written (changes stay pending)
+        """
+        with self._flush_lock:
+            with self._lock:
+                reset_corrections = self._corrections_reset
+                new_corrections = self._pending_corrections
+                save_examples = self._examples_dirty
+                examples = (
+                    {k: list(v) for k, v in self.few_shot_examples.items()}
+                    if save_examples
+                    else None
+                )
+                self._corrections_reset = False
+                self._pending_corrections = []
+                self._examples_dirty = False
+
+            if reset_corrections or new_corrections:
+                try:
+                    self._append_corrections(new_corrections, reset=reset_corrections)
+                except LearningError:
+                    with self._lock:
+                        self._corrections_reset |= reset_corrections
+                        self._pending_corrections[:0] = new_corrections
+                    raise
+
+            if save_examples:
+                try:
+                    self._save_examples(examples)
+                except LearningError:
+                    with self._lock:
+                        self._examples_dirty = True
+                    raise
+
+    def close(self) -> None:
+        """Stop the background writer and write any pending changes."""
+        self._closed.set()
+        self._save_requested.set()
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._writer_thread.join(timeout=2.0)
+        try:
+            self.flush()
+        finally:
+            if self._corrections_fp is not None:
+                self._corrections_fp.close()
+                self._corrections_fp = None
+
+    def _schedule_save(self) -> None:
+        """Wake the background writer, starting it on first use."""
+        if self._closed.is_set():
+            self.flush()
+            return
+
+        if self._writer_thread is None:
+            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread.start()
+
+        self._save_requested.set()
+
+    def _writer_loop(self) -> None:
+        """Background thread: coalesce bursts of changes into one write."""
+        while not self._closed.is_set():
+            self._save_requested.wait()
+            if self._closed.is_set():
+                break
+
+            # Wait out the debounce window (close() cuts it short)
+            if self._closed.wait(_SAVE_DEBOUNCE_SECONDS):
+                break
+            self._save_requested.clear()
+
+            try:
+                self.flush()
+            except LearningError:
+                # Non-critical: changes stay dirty and are retried next time
+                pass
+
+    def _rebuild_corrections_index(self) -> None:
+        """Regroup corrections by corrected outcome."""
+        self._corrections_by_outcome = {}
+        for correction in self.corrections:
+            self._corrections_by_outcome.setdefault(
+                correction["corrected_outcome"], []
+            ).append(correction)
 
     def _load_corrections(self) -> List[Dict]:
-        """Load corrections from JSON file."""
-        if not self.corrections_file.exists():
-            return []
+        """Load corrections from the JSON file followed by the JSONL log."""
+        corrections: List[Dict] = []
 
         try:
-            with open(self.corrections_file, "r") as f:
-                data = json.load(f)
-                return data.get("corrections", [])
+            if self.corrections_file.exists():
+                data = json_io.loads(self.corrections_file.read_bytes())
+                corrections.extend(data.get("corrections", []))
+
+            if self.corrections_log.exists():
+                with open(self.corrections_log, "rb") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            corrections.append(json_io.loads(line))
+                        except ValueError:
+                            # Torn final line from an interrupted write
+                            continue
         except Exception as e:
             raise LearningError(f"Failed to load corrections: {e}")
 
-    def _save_corrections(self) -> None:
-        """Save corrections to JSON file."""
+        return corrections
+
+    def _append_corrections(self, corrections: List[Dict], reset: bool = False) -> None:
+        """
+        Append corrections to the JSONL log.
+
+        Args:
+            corrections: New corrections to append (one line each)
+            reset: Truncate the log and drop the JSON file first
+        """
         try:
-            data = {"corrections": self.corrections}
-            with open(self.corrections_file, "w") as f:
-                json.dump(data, f, indent=2)
+            if reset:
+                if self._corrections_fp is not None:
+                    self._corrections_fp.close()
+                    self._corrections_fp = None
+                self.corrections_log.write_bytes(b"")
+                self.corrections_file.unlink(missing_ok=True)
+
+            if not corrections:
+                return
+
+            if self._corrections_fp is None:
+                self._corrections_fp = open(
+                    self.corrections_log, "ab", buffering=_LOG_BUFFER_SIZE
+                )
+
+            self._corrections_fp.write(
+                b"".join(json_io.dumps(c) + b"\n" for c in corrections)
+            )
+            self._corrections_fp.flush()
         except Exception as e:
             raise LearningError(f"Failed to save corrections: {e}")
 
@@ -240,17 +399,17 @@ class LearningService:
             return {}
 
         try:
-            with open(self.examples_file, "r") as f:
-                data = json.load(f)
-                return data.get("examples", {})
+            data = json_io.loads(self.examples_file.read_bytes())
+            return data.get("examples", {})
         except Exception as e:
             raise LearningError(f"Failed to load examples: {e}")
 
-    def _save_examples(self) -> None:
+    def _save_examples(self, examples: Dict[str, List[Dict]]) -> None:
         """Save few-shot examples to JSON file."""
         try:
-            data = {"examples": self.few_shot_examples}
-            with open(self.examples_file, "w") as f:
-                json.dump(data, f, indent=2)
+            data = {"examples": examples}
+            # Compact on purpose: train_from_images.save_examples writes this
+            # file in the same format (TRAINING_GUIDE.md covers hand editing)
+            json_io.atomic_write_bytes(self.examples_file, json_io.dumps(data, indent=False))
         except Exception as e:
             raise LearningError(f"Failed to save examples: {e}")
@@ -1,10 +1,23 @@
 """Motion detection service for shot event identification."""
 import time
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple
 
 import cv2
 import numpy as np
 
+# Gray-level change a full-resolution pixel needs to count as moving
+_DIFF_LEVELS = 20
+
+# Prefilter: pixel stride of the green-channel sample. The full test needs
+# threshold * 100% of (downsampled) pixels to move by more than the diff
+# cutoff, a mean change of at least threshold * cutoff; a sample mean below
+# half of that (margin for sampling) cannot be motion.
+_PREFILTER_STRIDE = 16
+
+# Row-sum variance must exceed column-sum variance by this factor for motion
+# to count as vertical (a shot) rather than horizontal (aiming)
+_VERTICAL_VARIANCE_RATIO = 1.5
+
 
 class MotionDetectorService:
     """
@@ -13,17 +26,37 @@ class MotionDetectorService:
     Detects when the golf ball has stopped moving (shot complete).
     """
 
-    def __init__(self, threshold: float = 0.02, ball_stop_duration: float = 1.0):
+    def __init__(
+        self,
+        threshold: float = 0.02,
+        ball_stop_duration: float = 1.0,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+        downsample: int = 4,
+    ):
         """
         Initialize motion detector.
 
         Args:
             threshold: Pixel change ratio (0.0-1.0) to consider motion
             ball_stop_duration: Seconds of stillness before shot complete
+            roi: Optional region of interest as (x0, y0, x1, y1) pixel bounds;
+                only this part of each frame is analyzed (default: full frame)
+            downsample: Shrink the grayscale frame by this factor per axis
+                before differencing (default: 4, i.e. 1/16 of the pixels;
+                1 disables). The per-pixel change cutoff is lowered by the
+                same factor so small, thin moving features still register.
         """
         self.threshold = threshold
         self.ball_stop_duration = ball_stop_duration
-        self.previous_frame: Optional[np.ndarray] = None
+        self.roi = roi
+        self.downsample = max(1, downsample)
+        # Area-averaging dilutes a one-pixel-wide feature's change by the
+        # factor, and independent pixel noise by the same factor, so the
+        # scaled cutoff keeps thin features (ball, flag, HUD text) above it
+        # with the same noise margin as at full resolution
+        self._diff_levels = max(1, round(_DIFF_LEVELS / self.downsample))
+        self.previous_gray: Optional[np.ndarray] = None
+        self._prev_sub: Optional[np.ndarray] = None
         self.last_motion_time: Optional[float] = None
         self.motion_detected = False
         self.shot_callback: Optional[Callable[[np.ndarray], None]] = None
@@ -39,37 +72,62 @@ class MotionDetectorService:
         Returns:
             True if motion detected, False otherwise
         """
-        if self.previous_frame is None:
-            self.previous_frame = frame.copy()
+        # Crop to region of interest (a view, no copy)
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            frame = frame[y0:y1, x0:x1]
+
+        # Cheap prefilter on a sparse green-channel sample: if it barely
+        # changed since the last full analysis, skip the full-frame work
+        sub = frame[::_PREFILTER_STRIDE, ::_PREFILTER_STRIDE, 1].copy()
+        if (
+            self.previous_gray is not None
+            and self._prev_sub is not None
+            and sub.shape == self._prev_sub.shape
+            and cv2.absdiff(sub, self._prev_sub).mean() < self.threshold * self._diff_levels / 2
+        ):
+            return False
+        self._prev_sub = sub
+
+        # Convert to grayscale once; the result is kept as the next reference
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+
+        # Area-average down to a small image; everything below is per-pixel
+        # and memory-bound, so this cuts the work by downsample**2
+        if self.downsample > 1:
+            height, width = gray.shape
+            gray = cv2.resize(
+                gray,
+                (max(1, width // self.downsample), max(1, height // self.downsample)),
+                interpolation=cv2.INTER_AREA,
+            )
+
+        if self.previous_gray is None:
+            self.previous_gray = gray
             return False
-
-        # Convert to grayscale
-        gray1 = cv2.cvtColor(self.previous_frame, cv2.COLOR_RGB2GRAY)
-        gray2 = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
 
         # Compute absolute difference
-        diff = cv2.absdiff(gray1, gray2)
-
-        # Apply Gaussian blur to reduce noise
-        blur = cv2.GaussianBlur(diff, (5, 5), 0)
+        diff = cv2.absdiff(self.previous_gray, gray)
 
-        # Threshold
-        _, thresh = cv2.threshold(blur, 20, 255, cv2.THRESH_BINARY)
+        # Threshold (no blur needed: the level cutoff already rejects
+        # low-amplitude sensor/compression noise, and only the count matters)
+        _, thresh = cv2.threshold(diff, self._diff_levels, 255, cv2.THRESH_BINARY)
 
         # Count motion pixels
         motion_pixels = cv2.countNonZero(thresh)
-        total_pixels = frame.shape[0] * frame.shape[1]
+        total_pixels = gray.shape[0] * gray.shape[1]
         motion_ratio = motion_pixels / total_pixels
 
-        # Analyze motion direction to distinguish aiming from actual shots
-        is_vertical_motion = self._is_primarily_vertical_motion(thresh)
+        # Update previous frame (cvtColor allocated fresh memory, no copy needed)
+        self.previous_gray = gray
 
-        # Update previous frame
-        self.previous_frame = frame.copy()
+        # Too little change to be a shot; skip the direction analysis
+        if motion_ratio <= self.threshold:
+            return False
 
         # Detect motion only if it's primarily vertical (actual shot)
         # Horizontal motion (aiming left/right) is ignored
-        if motion_ratio > self.threshold and is_vertical_motion:
+        if self._is_primarily_vertical_motion(thresh):
             self.motion_detected = True
             self.last_motion_time = time.time()
             return True
@@ -86,13 +144,11 @@ class MotionDetectorService:
         Returns:
             True if motion is primarily vertical, False for horizontal
         """
-        height, width = thresh.shape
-
         # Sum motion pixels in each row (vertical motion indicator)
-        vertical_motion = np.sum(thresh, axis=1)
+        vertical_motion = cv2.reduce(thresh, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
 
         # Sum motion pixels in each column (horizontal motion indicator)
-        horizontal_motion = np.sum(thresh, axis=0)
+        horizontal_motion = cv2.reduce(thresh, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
 
         # Calculate variance to determine dominant motion direction
         # Higher variance means motion is concentrated in certain areas
@@ -100,15 +156,10 @@ class MotionDetectorService:
         horizontal_variance = np.var(horizontal_motion)
 
         # If vertical variance is significantly higher, it's a shot
-        # If horizontal variance is higher, it's aiming adjustment
-        # Use ratio of 1.5 as threshold for "primarily vertical"
-        if vertical_variance == 0 and horizontal_variance == 0:
-            return False
-
-        variance_ratio = vertical_variance / (horizontal_variance + 1e-10)
-
-        # Primarily vertical if variance ratio > 1.5
-        return variance_ratio > 1.5
+        # If horizontal variance is higher, it's aiming adjustment.
+        # Compared by multiplication: no division, and no epsilon needed for
+        # zero horizontal variance (all-zero motion compares 0 > 0, False)
+        return vertical_variance > _VERTICAL_VARIANCE_RATIO * horizontal_variance
 
     def is_ball_stopped(self) -> bool:
         """
@@ -130,7 +181,8 @@ class MotionDetectorService:
 
     def reset(self) -> None:
         """Reset motion detector state (e.g., between rounds)."""
-        self.previous_frame = None
+        self.previous_gray = None
+        self._prev_sub = None
         self.last_motion_time = None
         self.motion_detected = False
         self.last_shot_frame = None
@@ -1,27 +1,75 @@
 """Pattern cache service for screenshot matching and outcome prediction."""
-import json
 import threading
+import time
+import zlib
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
 
-import imagehash
+import cv2
 import numpy as np
-from PIL import Image
 
+from src.lib import json_io
 from src.lib.exceptions import CacheError
 from src.models.outcome import Outcome
 
+# pHash geometry (imagehash.phash defaults): 32x32 grayscale input, 8x8 DCT block
+_PHASH_SIZE = 8
+_PHASH_INPUT_SIZE = 32
+
+# Rows of the (unnormalized) DCT-II basis for the 8 lowest frequencies. The
+# scale factor scipy applies is dropped; it cannot change the median split.
+_DCT_BASIS = np.cos(
+    np.pi
+    * np.arange(_PHASH_SIZE)[:, None]
+    * (2 * np.arange(_PHASH_INPUT_SIZE)[None, :] + 1)
+    / (2 * _PHASH_INPUT_SIZE)
+)
+
+# Number of recent screenshot hashes memoized
+_HASH_MEMO_SIZE = 32
+
+# Bit weights for packing the 64 pHash bits into an int, first bit most significant
+_BIT_WEIGHTS = np.left_shift(np.uint64(1), np.arange(63, -1, -1, dtype=np.uint64))
+
+# Outcome <-> int8 code used in the outcome column
+_OUTCOMES = tuple(Outcome)
+_OUTCOME_CODES = {outcome: code for code, outcome in enumerate(_OUTCOMES)}
+
+# Row capacity of the first allocation; grows by doubling
+_INITIAL_CAPACITY = 64
+
+# Eviction: fraction of rows dropped when over max_size, and how many seconds
+# of idle time one cache hit offsets when ranking victims
+_EVICT_FRACTION = 0.1
+_SECONDS_PER_HIT = 3600.0
+
+# Popcount over uint64 arrays: native on NumPy >= 2.0, byte lookup table otherwise
+if hasattr(np, "bitwise_count"):
+
+    def _popcount64(values: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(values)
+
+else:
+    _POPCOUNT_LUT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount64(values: np.ndarray) -> np.ndarray:
+        return _POPCOUNT_LUT[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
 
 @dataclass
 class CachedPattern:
-    """Represents a cached screenshot pattern with outcome."""
+    """Represents a cached screenshot pattern with outcome (a copy of one row)."""
 
-    hash: str
+    hash_int: int
     outcome: Outcome
     confidence: float
     hit_count: int = 0
     last_used: Optional[str] = None
+    # Epoch seconds of the latest use; rendered into last_used on persist
+    last_used_epoch: Optional[float] = None
 
 
 class PatternCacheService:
@@ -29,28 +77,93 @@ class PatternCacheService:
     Pattern cache service using perceptual hashing.
 
     Matches similar screenshots to cached outcomes, reducing AI API calls.
-    Uses imagehash library with Hamming distance threshold.
+    Hashes are 64-bit pHash values kept as ints, compared by Hamming distance.
+
+    Patterns are stored column-wise in preallocated numpy arrays (one row
+    per pattern) with a hash -> row index, so scans and statistics are
+    vectorized over contiguous memory.
     """
 
-    def __init__(self, cache_file: str = "data/cache/pattern_cache.json", hamming_threshold: int = 10):
+    def __init__(
+        self,
+        cache_file: str = "data/cache/pattern_cache.json",
+        hamming_threshold: int = 10,
+        max_size: Optional[int] = None,
+        autosave_interval: Optional[float] = None,
+        autosave_every: int = 10,
+    ):
         """
         Initialize pattern cache.
 
         Args:
             cache_file: Path to JSON cache file
             hamming_threshold: Maximum Hamming distance for match (default: 10)
+            max_size: Maximum patterns to keep; past this the least recently
+                and least often used 10% are evicted (default: unbounded)
+            autosave_interval: If set, a background thread saves unsaved
+                changes every this many seconds (default: only on persist/close)
+            autosave_every: Save early once this many changes are pending
+                (default: 10; only used with autosave_interval)
         """
         self.cache_file = Path(cache_file)
         self.hamming_threshold = hamming_threshold
-        self.patterns: Dict[str, CachedPattern] = {}
+        self.max_size = max_size
+        self.autosave_every = autosave_every
         self._lock = threading.Lock()
 
+        # Background persistence: count of unsaved changes, and a writer
+        # thread woken by the interval timer or by enough changes piling up
+        self._dirty = 0
+        self._write_lock = threading.Lock()
+        self._autosave_requested = threading.Event()
+        self._autosave_stopped = threading.Event()
+        self._autosave_thread: Optional[threading.Thread] = None
+
+        # Column storage; rows [0, _size) are live
+        self._size = 0
+        self._index: Dict[int, int] = {}
+        self._allocate(0)
+
+        # Immutable search snapshot: length-_size views of the hash, outcome
+        # and confidence columns. Writers publish a new tuple under the lock
+        # with one assignment, so readers scan it without locking.
+        self._snapshot: Tuple[np.ndarray, np.ndarray, np.ndarray] = (
+            self._hashes[:0],
+            self._outcomes[:0],
+            self._confidences[:0],
+        )
+
+        # Recently computed hashes keyed by a cheap frame fingerprint, so the
+        # same screenshot passed to several methods is only hashed once
+        self._hash_memo: OrderedDict[tuple, int] = OrderedDict()
+        self._memo_lock = threading.Lock()
+
         # Ensure cache directory exists
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Load existing cache
         self.load()
 
+        if autosave_interval is not None:
+            self._autosave_thread = threading.Thread(
+                target=self._autosave_loop, args=(autosave_interval,), daemon=True
+            )
+            self._autosave_thread.start()
+
+    @property
+    def patterns(self) -> Dict[int, CachedPattern]:
+        """
+        Cached patterns keyed by hash (a snapshot copy; edits are not stored).
+
+        Returns:
+            Dictionary of hash -> CachedPattern
+        """
+        with self._lock:
+            return {
+                int(self._hashes[row]): self._row_to_pattern(row)
+                for row in range(self._size)
+            }
+
     def find_match(self, screenshot: np.ndarray) -> Optional[tuple[Outcome, float]]:
         """
         Find matching pattern in cache.
@@ -61,31 +174,28 @@ class PatternCacheService:
         Returns:
             Tuple of (outcome, confidence) if match found, None otherwise
         """
-        with self._lock:
-            # Compute perceptual hash
-            img_hash = self._compute_hash(screenshot)
-
-            # Search for match with Hamming distance < threshold
-            best_match: Optional[CachedPattern] = None
-            best_distance = self.hamming_threshold
+        # Compute perceptual hash
+        img_hash = self._compute_hash(screenshot)
 
-            for cached_pattern in self.patterns.values():
-                distance = img_hash - imagehash.hex_to_hash(cached_pattern.hash)
+        # Search the published snapshot without locking
+        hashes, outcomes, confidences = snapshot = self._snapshot
+        row = self._search(img_hash, snapshot)
 
-                if distance < best_distance:
-                    best_distance = distance
-                    best_match = cached_pattern
-
-            if best_match:
-                # Update hit count
-                best_match.hit_count += 1
-                from datetime import datetime
+        if row is None:
+            return None
 
-                best_match.last_used = datetime.now().isoformat()
+        matched_hash = int(hashes[row])
+        result = (_OUTCOMES[outcomes[row]], float(confidences[row]))
 
-                return (best_match.outcome, best_match.confidence)
+        # Update hit count (the row may have moved since the snapshot)
+        with self._lock:
+            live_row = self._index.get(matched_hash)
+            if live_row is not None:
+                self._hit_counts[live_row] += 1
+                self._last_used_epoch[live_row] = time.time()
+                self._mark_dirty()
 
-            return None
+        return result
 
     def add_pattern(
         self, screenshot: np.ndarray, outcome: Outcome, confidence: float
@@ -98,52 +208,166 @@ class PatternCacheService:
             outcome: Detected outcome
             confidence: Confidence score (0.0-1.0)
         """
+        img_hash = self._compute_hash(screenshot)
+
         with self._lock:
-            img_hash = self._compute_hash(screenshot)
-            hash_str = str(img_hash)
-
-            # Add or update pattern
-            if hash_str in self.patterns:
-                # Update existing pattern
-                pattern = self.patterns[hash_str]
-                pattern.outcome = outcome
-                pattern.confidence = confidence
-            else:
-                # Add new pattern
-                from datetime import datetime
-
-                self.patterns[hash_str] = CachedPattern(
-                    hash=hash_str,
-                    outcome=outcome,
-                    confidence=confidence,
-                    hit_count=0,
-                    last_used=datetime.now().isoformat(),
-                )
+            self._insert(img_hash, outcome, confidence)
+
+    def upsert(self, screenshot: np.ndarray, outcome: Outcome, confidence: float) -> bool:
+        """
+        Update the matching cached pattern, or add one if none matches.
+
+        Hashes the screenshot once and searches and writes under a single
+        lock, instead of a find_match followed by add_pattern.
+
+        Args:
+            screenshot: Screenshot to cache
+            outcome: Detected outcome
+            confidence: Confidence score (0.0-1.0)
+
+        Returns:
+            True if an existing pattern was updated, False if one was added
+        """
+        img_hash = self._compute_hash(screenshot)
 
-    def persist(self) -> None:
-        """Save cache to disk (JSON format)."""
         with self._lock:
+            # Writers hold the lock, so the snapshot rows match live rows
+            row = self._search(img_hash, self._snapshot)
+
+            if row is not None:
+                self._outcomes[row] = _OUTCOME_CODES[outcome]
+                self._confidences[row] = confidence
+                self._last_used_epoch[row] = time.time()
+                self._mark_dirty()
+                return True
+
+            self._insert(img_hash, outcome, confidence)
+            return False
+
+    def _search(
+        self, img_hash: int, snapshot: Tuple[np.ndarray, np.ndarray, np.ndarray]
+    ) -> Optional[int]:
+        """
+        Find the closest cached pattern within the Hamming threshold.
+
+        Safe without the lock: reads only the given snapshot.
+
+        Args:
+            img_hash: 64-bit query hash
+            snapshot: Search snapshot (hashes, outcomes, confidences)
+
+        Returns:
+            Row of the closest matching pattern in the snapshot, or None
+        """
+        hashes = snapshot[0]
+        if not len(hashes):
+            return None
+
+        # Exact repeat of a cached screen: distance 0, no scan needed. The
+        # index may be newer than the snapshot, so confirm the row.
+        row = self._index.get(img_hash)
+        if row is not None and row < len(hashes) and hashes[row] == img_hash:
+            return row
+
+        # Hamming distance to every cached hash in one XOR + popcount pass
+        query = np.uint64(img_hash)
+        distances = _popcount64(hashes ^ query)
+        best_index = int(distances.argmin())
+
+        # Search for match with Hamming distance < threshold
+        if distances[best_index] < self.hamming_threshold:
+            return best_index
+
+        return None
+
+    def _insert(self, img_hash: int, outcome: Outcome, confidence: float) -> None:
+        """
+        Add a pattern, or update the one with exactly this hash.
+
+        Caller holds the lock.
+
+        Args:
+            img_hash: 64-bit hash
+            outcome: Detected outcome
+            confidence: Confidence score (0.0-1.0)
+        """
+        self._mark_dirty()
+
+        # Add or update pattern
+        row = self._index.get(img_hash)
+        if row is not None:
+            # Update existing pattern
+            self._outcomes[row] = _OUTCOME_CODES[outcome]
+            self._confidences[row] = confidence
+            return
+
+        # Add new pattern
+        self._append_row(img_hash, outcome, confidence, 0, time.time())
+        if self.max_size is not None and self._size > self.max_size:
+            self._evict()
+        self._publish()
+
+    def persist(self) -> None:
+        """
+        Save cache to disk (JSON format) now.
+
+        Raises:
+            CacheError: If the file cannot be written
+        """
+        with self._write_lock:
+            # Copy the live columns under the lock; serialize outside it
+            with self._lock:
+                size = self._size
+                hashes = self._hashes[:size].tolist()
+                outcomes = self._outcomes[:size].tolist()
+                confidences = self._confidences[:size].tolist()
+                hit_counts = self._hit_counts[:size].tolist()
+                last_used = self._last_used_epoch[:size].tolist()
+                dirty = self._dirty
+                self._dirty = 0
+
             try:
-                # Convert patterns to JSON-serializable format
-                cache_data = {
-                    "patterns": [
-                        {
-                            "hash": pattern.hash,
-                            "outcome": str(pattern.outcome),
-                            "confidence": pattern.confidence,
-                            "hit_count": pattern.hit_count,
-                            "last_used": pattern.last_used,
-                        }
-                        for pattern in self.patterns.values()
-                    ]
-                }
-
-                with open(self.cache_file, "w") as f:
-                    json.dump(cache_data, f, indent=2)
+                # Serialize each pattern separately and write the pieces with
+                # one gathered write, avoiding a full-document intermediate
+                chunks = [b'{"patterns":[']
+                for row in range(size):
+                    if row:
+                        chunks.append(b",")
+                    epoch = last_used[row]
+                    chunks.append(
+                        json_io.dumps(
+                            {
+                                "hash": f"{hashes[row]:016x}",
+                                "outcome": str(_OUTCOMES[outcomes[row]]),
+                                "confidence": confidences[row],
+                                "hit_count": hit_counts[row],
+                                "last_used": (
+                                    None
+                                    if epoch != epoch  # NaN: never used
+                                    else datetime.fromtimestamp(epoch).isoformat()
+                                ),
+                            }
+                        )
+                    )
+                chunks.append(b"]}")
+
+                json_io.atomic_write_chunks(self.cache_file, chunks)
 
             except Exception as e:
+                with self._lock:
+                    self._dirty += dirty
                 raise CacheError(f"Failed to persist pattern cache: {e}")
 
+    def close(self) -> None:
+        """Stop background saving and write any unsaved changes."""
+        self._autosave_stopped.set()
+        self._autosave_requested.set()
+        if self._autosave_thread and self._autosave_thread.is_alive():
+            self._autosave_thread.join(timeout=2.0)
+
+        if self._dirty:
+            self.persist()
+
     def load(self) -> None:
         """Load cache from disk."""
         with self._lock:
@@ -152,20 +376,26 @@ class PatternCacheService:
                 return
 
             try:
-                with open(self.cache_file, "r") as f:
-                    cache_data = json.load(f)
-
-                # Load patterns
-                self.patterns = {}
-                for pattern_data in cache_data.get("patterns", []):
-                    pattern = CachedPattern(
-                        hash=pattern_data["hash"],
-                        outcome=Outcome(pattern_data["outcome"]),
-                        confidence=pattern_data["confidence"],
-                        hit_count=pattern_data.get("hit_count", 0),
-                        last_used=pattern_data.get("last_used"),
+                cache_data = json_io.loads(self.cache_file.read_bytes())
+                records = cache_data.get("patterns", [])
+
+                # Load patterns into fresh arrays; the old ones stay intact
+                # for readers still holding the previous snapshot
+                self._allocate(len(records))
+                for pattern_data in records:
+                    last_used = pattern_data.get("last_used")
+                    hash_int = int(pattern_data["hash"], 16)
+                    if hash_int in self._index:
+                        continue
+                    self._append_row(
+                        hash_int,
+                        Outcome(pattern_data["outcome"]),
+                        pattern_data["confidence"],
+                        pattern_data.get("hit_count", 0),
+                        datetime.fromisoformat(last_used).timestamp() if last_used else np.nan,
                     )
-                    self.patterns[pattern.hash] = pattern
+
+                self._publish()
 
             except Exception as e:
                 raise CacheError(f"Failed to load pattern cache: {e}")
@@ -178,8 +408,8 @@ class PatternCacheService:
             Dictionary with total_patterns, total_hits, hit_rate
         """
         with self._lock:
-            total_patterns = len(self.patterns)
-            total_hits = sum(p.hit_count for p in self.patterns.values())
+            total_patterns = self._size
+            total_hits = int(self._hit_counts[: self._size].sum())
 
             # Calculate hit rate (hits / (patterns + hits))
             # This approximates cache_hits / total_lookups
@@ -200,23 +430,148 @@ class PatternCacheService:
             screenshot: Screenshot to find
             new_confidence: New confidence value
         """
-        with self._lock:
-            img_hash = self._compute_hash(screenshot)
-            hash_str = str(img_hash)
+        img_hash = self._compute_hash(screenshot)
 
-            if hash_str in self.patterns:
-                self.patterns[hash_str].confidence = new_confidence
+        with self._lock:
+            row = self._index.get(img_hash)
+            if row is not None:
+                self._confidences[row] = new_confidence
+                self._mark_dirty()
 
     def clear(self) -> None:
         """Clear all cached patterns (useful for testing or reset)."""
         with self._lock:
-            self.patterns = {}
+            self._allocate(0)
+            self._publish()
 
             # Delete cache file
             if self.cache_file.exists():
                 self.cache_file.unlink()
 
-    def _compute_hash(self, screenshot: np.ndarray) -> imagehash.ImageHash:
+    def _mark_dirty(self) -> None:
+        """Count an unsaved change, waking the autosave thread if due (caller holds the lock)."""
+        self._dirty += 1
+        if self._dirty >= self.autosave_every:
+            self._autosave_requested.set()
+
+    def _autosave_loop(self, interval: float) -> None:
+        """Background thread: save pending changes periodically."""
+        while not self._autosave_stopped.is_set():
+            self._autosave_requested.wait(interval)
+            self._autosave_requested.clear()
+            if self._autosave_stopped.is_set():
+                break
+
+            if self._dirty:
+                try:
+                    self.persist()
+                except CacheError:
+                    # Non-critical: changes stay pending for the next attempt
+                    pass
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replace the columns with new, empty arrays (caller holds the lock).
+
+        Args:
+            capacity: Rows to preallocate
+        """
+        self._size = 0
+        self._index = {}
+        self._hashes = np.zeros(capacity, dtype=np.uint64)
+        self._outcomes = np.zeros(capacity, dtype=np.int8)
+        self._confidences = np.zeros(capacity, dtype=np.float64)
+        self._hit_counts = np.zeros(capacity, dtype=np.int64)
+        self._last_used_epoch = np.full(capacity, np.nan, dtype=np.float64)
+
+    def _append_row(
+        self,
+        img_hash: int,
+        outcome: Outcome,
+        confidence: float,
+        hit_count: int,
+        last_used_epoch: float,
+    ) -> None:
+        """Write a new row, doubling the columns when full (caller holds the lock)."""
+        if self._size == len(self._hashes):
+            # Grow into new arrays (copies) so published snapshot views keep
+            # pointing at unchanged memory
+            capacity = max(_INITIAL_CAPACITY, 2 * len(self._hashes))
+            for name in (
+                "_hashes",
+                "_outcomes",
+                "_confidences",
+                "_hit_counts",
+                "_last_used_epoch",
+            ):
+                old = getattr(self, name)
+                grown = np.empty(capacity, dtype=old.dtype)
+                grown[: self._size] = old[: self._size]
+                setattr(self, name, grown)
+
+        row = self._size
+        self._hashes[row] = img_hash
+        self._outcomes[row] = _OUTCOME_CODES[outcome]
+        self._confidences[row] = confidence
+        self._hit_counts[row] = hit_count
+        self._last_used_epoch[row] = last_used_epoch
+        self._index[img_hash] = row
+        self._size += 1
+
+    def _evict(self) -> None:
+        """Drop the stalest patterns in one batch (caller holds the lock)."""
+        size = self._size
+        victims = max(size - self.max_size, int(size * _EVICT_FRACTION))
+
+        # Staleness: idle seconds, less credit for hits; never-used rows
+        # count as idle since the epoch
+        now = time.time()
+        last_used = np.nan_to_num(self._last_used_epoch[:size], nan=0.0)
+        staleness = (now - last_used) - self._hit_counts[:size] * _SECONDS_PER_HIT
+
+        keep = np.ones(size, dtype=bool)
+        keep[np.argpartition(staleness, size - victims)[size - victims :]] = False
+
+        # Compact survivors into new arrays, leaving published views intact
+        self._hashes = self._hashes[:size][keep]
+        self._outcomes = self._outcomes[:size][keep]
+        self._confidences = self._confidences[:size][keep]
+        self._hit_counts = self._hit_counts[:size][keep]
+        self._last_used_epoch = self._last_used_epoch[:size][keep]
+        self._size = len(self._hashes)
+        self._index = {int(h): row for row, h in enumerate(self._hashes)}
+
+    def _publish(self) -> None:
+        """Publish a new search snapshot of the live rows (caller holds the lock)."""
+        size = self._size
+        self._snapshot = (
+            self._hashes[:size],
+            self._outcomes[:size],
+            self._confidences[:size],
+        )
+
+    def _row_to_pattern(self, row: int) -> CachedPattern:
+        """
+        Copy one row out as a CachedPattern (caller holds the lock).
+
+        Args:
+            row: Row index
+
+        Returns:
+            CachedPattern with the row's values
+        """
+        epoch = float(self._last_used_epoch[row])
+        has_epoch = not np.isnan(epoch)
+        return CachedPattern(
+            hash_int=int(self._hashes[row]),
+            outcome=_OUTCOMES[self._outcomes[row]],
+            confidence=float(self._confidences[row]),
+            hit_count=int(self._hit_counts[row]),
+            last_used=datetime.fromtimestamp(epoch).isoformat() if has_epoch else None,
+            last_used_epoch=epoch if has_epoch else None,
+        )
+
+    def _compute_hash(self, screenshot: np.ndarray) -> int:
         """
         Compute perceptual hash for screenshot.
 
@@ -224,10 +579,48 @@ class PatternCacheService:
             screenshot: RGB numpy array
 
         Returns:
-            ImageHash object
+            64-bit hash as an int
+        """
+        # Fingerprint: shape plus CRC32 of every pixel, so frames that differ
+        # anywhere get their own entry (CRC32 runs far faster than the pHash)
+        key = (screenshot.shape, zlib.crc32(np.ascontiguousarray(screenshot)))
+
+        with self._memo_lock:
+            cached = self._hash_memo.get(key)
+            if cached is not None:
+                self._hash_memo.move_to_end(key)
+                return cached
+
+        hash_int = self._phash(screenshot)
+
+        with self._memo_lock:
+            self._hash_memo[key] = hash_int
+            if len(self._hash_memo) > _HASH_MEMO_SIZE:
+                self._hash_memo.popitem(last=False)
+
+        return hash_int
+
+    @staticmethod
+    def _phash(screenshot: np.ndarray) -> int:
         """
-        # Convert numpy array to PIL Image
-        img = Image.fromarray(screenshot.astype("uint8"), "RGB")
+        Compute the 64-bit perceptual hash of a screenshot (uncached).
+
+        Args:
+            screenshot: RGB numpy array
 
-        # Compute perceptual hash (default: phash with 8x8 DCT)
-        return imagehash.phash(img)
+        Returns:
+            64-bit hash as an int
+        """
+        # Perceptual hash in the style of imagehash.phash: 32x32 grayscale,
+        # low-frequency 8x8 DCT block thresholded at its median. Grayscale
+        # and the area-average shrink run in OpenCV (SIMD), and only the 8
+        # needed DCT rows are computed, as two small matrix products.
+        gray = cv2.cvtColor(screenshot.astype(np.uint8, copy=False), cv2.COLOR_RGB2GRAY)
+        small = cv2.resize(
+            gray, (_PHASH_INPUT_SIZE, _PHASH_INPUT_SIZE), interpolation=cv2.INTER_AREA
+        )
+        pixels = small.astype(np.float64)
+        low_freq = _DCT_BASIS @ pixels @ _DCT_BASIS.T
+
+        bits = (low_freq > np.median(low_freq)).ravel()
+        return int(_BIT_WEIGHTS[bits].sum())
@@ -1,14 +1,53 @@
 """Screen capture service for GS Pro window detection and monitoring."""
+import sys
 import threading
 import time
-from typing import Optional
+from typing import List, Optional, Tuple
 
+import cv2
 import mss
 import numpy as np
 import pygetwindow as gw
 
 from src.lib.exceptions import CaptureError, WindowNotFoundError
 
+# DXGI Desktop Duplication capture (Windows, optional): much faster than
+# MSS's GDI copies for whole-monitor capture
+if sys.platform == 'win32':
+    try:
+        import dxcam
+        DXCAM_AVAILABLE = True
+    except ImportError:
+        DXCAM_AVAILABLE = False
+else:
+    DXCAM_AVAILABLE = False
+
+# Preallocated frame slots the capture thread cycles through
+_RING_SLOTS = 3
+
+# Seconds between re-reads of a captured window's position while monitoring
+_WINDOW_RECT_TTL = 1.0
+
+
+def _bgra_to_rgb(screenshot, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Convert an MSS screenshot to an RGB array in a single pass.
+
+    The raw BGRA buffer is wrapped without copying and OpenCV drops alpha
+    and swaps channels straight into a contiguous output.
+
+    Args:
+        screenshot: mss.base.ScreenShot
+        out: Optional preallocated (H, W, 3) uint8 array to write into
+
+    Returns:
+        Contiguous RGB array (out, if given)
+    """
+    bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+        screenshot.height, screenshot.width, 4
+    )
+    return cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB, dst=out)
+
 
 class ScreenCaptureService:
     """
@@ -17,22 +56,44 @@ class ScreenCaptureService:
     Uses MSS for fast screen capture and pygetwindow for window detection.
     """
 
-    def __init__(self, monitor_index: int = 0):
+    def __init__(self, monitor_index: int = 0, output_scale: float = 1.0):
         """
         Initialize screen capture service.
 
         Args:
             monitor_index: Index of monitor to capture (0 = primary, 1 = second, etc.)
+            output_scale: Resize factor applied to captured frames (default: 1.0,
+                full resolution; e.g. 0.5 halves each dimension)
         """
         self.sct = None  # Will be created in the thread that uses it
         self.window_id: Optional[str] = None
         self.window_rect: Optional[dict] = None
+        # Window object for window_id, kept so later captures only re-read
+        # its rect instead of enumerating every top-level window
+        self._window = None
+        self._window_title: Optional[str] = None
+        # (left, top, width, height) behind window_rect when it came from
+        # _window, so an unchanged rect reuses the same dict
+        self._window_box: Optional[tuple] = None
+        # Monitor index when capturing a whole monitor (enables DXGI capture)
+        self._capture_monitor: Optional[int] = None
         self.monitoring = False
         self.monitor_thread: Optional[threading.Thread] = None
-        self.latest_frame: Optional[np.ndarray] = None
+        # Frame ring buffer: the capture thread converts into the slot after
+        # the published one, then publishes that slot's read-only view with a
+        # single attribute store, so readers never take a lock. _seq counts
+        # publications, letting readers detect the writer lapping a slot.
+        self._ring: List[np.ndarray] = []
+        self._ring_views: List[np.ndarray] = []
+        self._ring_shape: Optional[Tuple[int, int, int]] = None
+        self._write_idx = -1
+        self._seq = 0
+        self._latest: Optional[np.ndarray] = None
         self.fps = 2
-        self._lock = threading.Lock()
         self.monitor_index = monitor_index
+        self.output_scale = output_scale
+        # Full-resolution conversion buffer used before downscaling
+        self._rgb_full: Optional[np.ndarray] = None
 
     def find_gs_pro_window(self) -> Optional[str]:
         """
@@ -63,6 +124,8 @@ class ScreenCaptureService:
                 "height": monitor["height"],
             }
             self.window_id = f"Monitor {self.monitor_index + 1}"
+            self._capture_monitor = self.monitor_index
+            self._window_box = None
             return f"Monitor {self.monitor_index + 1} ({monitor['width']}x{monitor['height']})"
         except Exception as e:
             raise WindowNotFoundError(f"Failed to access monitor: {e}")
@@ -119,16 +182,8 @@ class ScreenCaptureService:
         if window_id:
             self.window_id = window_id
             # Update window rect
-            windows = gw.getWindowsWithTitle(window_id)
-            if not windows:
-                raise WindowNotFoundError(f"Window not found: {window_id}")
-            window = windows[0]
-            self.window_rect = {
-                "left": window.left,
-                "top": window.top,
-                "width": window.width,
-                "height": window.height,
-            }
+            self.window_rect = self._get_window_rect(window_id)
+            self._capture_monitor = None
 
         if not self.window_rect:
             raise WindowNotFoundError("No window selected. Call find_gs_pro_window() first.")
@@ -136,14 +191,67 @@ class ScreenCaptureService:
         try:
             # Capture using MSS
             screenshot = self.sct.grab(self.window_rect)
-            # Convert to RGB numpy array
-            img = np.array(screenshot)
             # MSS returns BGRA, convert to RGB
-            img_rgb = img[:, :, :3][:, :, ::-1]  # Drop alpha and BGR->RGB
+            img_rgb = _bgra_to_rgb(screenshot)
+            if self.output_scale != 1.0:
+                img_rgb = cv2.resize(
+                    img_rgb,
+                    self._scaled_size(screenshot.width, screenshot.height),
+                    interpolation=cv2.INTER_AREA,
+                )
             return img_rgb
         except Exception as e:
             raise CaptureError(f"Failed to capture screenshot: {e}")
 
+    def _get_window_rect(self, title: str) -> dict:
+        """
+        Get the current bounds of the window with the given title.
+
+        The window is looked up by title once and cached; later calls only
+        query its rect. If the cached window is gone, it is looked up again.
+
+        Args:
+            title: Window title
+
+        Returns:
+            Capture region dict (left, top, width, height)
+
+        Raises:
+            WindowNotFoundError: If no window has this title
+        """
+        if self._window is not None and self._window_title == title:
+            try:
+                # One GetWindowRect call (vs. one per left/top/width/height)
+                return self._rect_from_box(tuple(self._window.box))
+            except Exception:
+                # Window was closed or recreated; find it again
+                self._window = None
+
+        windows = gw.getWindowsWithTitle(title)
+        if not windows:
+            raise WindowNotFoundError(f"Window not found: {title}")
+
+        self._window = windows[0]
+        self._window_title = title
+        return self._rect_from_box(tuple(self._window.box))
+
+    def _rect_from_box(self, box: tuple) -> dict:
+        """
+        Build a capture region from a window box, reusing the current one.
+
+        Args:
+            box: Window (left, top, width, height)
+
+        Returns:
+            window_rect itself if the box is unchanged, else a new region dict
+        """
+        if box == self._window_box and self.window_rect is not None:
+            return self.window_rect
+
+        left, top, width, height = box
+        self._window_box = box
+        return {"left": left, "top": top, "width": width, "height": height}
+
     def start_monitoring(self, window_id: Optional[str] = None, fps: int = 2) -> None:
         """
         Begin continuous screen capture at specified FPS.
@@ -175,45 +283,109 @@ class ScreenCaptureService:
         self.monitoring = False
         if self.monitor_thread:
             self.monitor_thread.join(timeout=2.0)
-        self.latest_frame = None
+        self._latest = None
 
-    def get_latest_frame(self) -> Optional[np.ndarray]:
+    def get_latest_frame(self, copy: bool = False) -> Optional[np.ndarray]:
         """
         Get most recent captured frame.
 
+        By default the frame is returned without copying, as a read-only view
+        of a ring buffer slot that the capture thread reuses two frames later.
+        Pass copy=True to keep it beyond the current loop iteration.
+
+        Args:
+            copy: Return a private, writable copy (default: False)
+
         Returns:
             Latest screenshot or None if no frames captured
         """
-        with self._lock:
-            return self.latest_frame.copy() if self.latest_frame is not None else None
+        while True:
+            seq = self._seq
+            frame = self._latest
+            if frame is None or not copy:
+                return frame
+
+            frame = frame.copy()
+
+            # The slot is only rewritten once the writer has published
+            # _RING_SLOTS - 1 more frames; otherwise the copy may be torn
+            if self._seq - seq < _RING_SLOTS - 1:
+                return frame
 
     def _monitor_loop(self) -> None:
         """
         Background thread loop for continuous capture.
 
-        Captures frames at specified FPS and stores in latest_frame.
+        Captures frames at specified FPS into the frame ring buffer. Whole
+        monitors are captured with DXGI Desktop Duplication when dxcam is
+        installed; MSS is used otherwise.
         """
         # Create MSS instance in this thread
         thread_sct = mss.mss()
+        camera = self._create_dxgi_camera()
         interval = 1.0 / self.fps
+        rect_checked_at = time.monotonic()
 
         try:
             while self.monitoring:
                 try:
+                    # Follow a captured window if it moves or resizes; the
+                    # cached window makes this one rect query per TTL
+                    if self._capture_monitor is None and self._window_title:
+                        now = time.monotonic()
+                        if now - rect_checked_at >= _WINDOW_RECT_TTL:
+                            rect_checked_at = now
+                            try:
+                                rect = self._get_window_rect(self._window_title)
+                                if rect is not self.window_rect:
+                                    self.window_rect = rect
+                            except WindowNotFoundError:
+                                # Keep capturing the last known area
+                                pass
+
                     # Capture using thread-local MSS instance
                     if not self.window_rect:
                         print("No window rect set")
                         time.sleep(interval)
                         continue
 
-                    screenshot = thread_sct.grab(self.window_rect)
-                    # Convert to RGB numpy array
-                    img = np.array(screenshot)
-                    # MSS returns BGRA, convert to RGB
-                    img_rgb = img[:, :, :3][:, :, ::-1]  # Drop alpha and BGR->RGB
-
-                    with self._lock:
-                        self.latest_frame = img_rgb
+                    if camera is not None and self._capture_monitor is not None:
+                        # DXGI returns RGB directly, or None if the screen
+                        # hasn't changed since the last grab
+                        frame = camera.grab()
+                        if frame is not None:
+                            height, width = frame.shape[:2]
+                            write_idx = self._next_slot(width, height)
+                            if self.output_scale != 1.0:
+                                cv2.resize(
+                                    frame,
+                                    self._scaled_size(width, height),
+                                    dst=self._ring[write_idx],
+                                    interpolation=cv2.INTER_AREA,
+                                )
+                            else:
+                                np.copyto(self._ring[write_idx], frame)
+                            self._publish(write_idx)
+                    else:
+                        screenshot = thread_sct.grab(self.window_rect)
+                        width, height = screenshot.width, screenshot.height
+
+                        # MSS returns BGRA, convert to RGB in the next free
+                        # slot (via a full-size buffer when downscaling)
+                        write_idx = self._next_slot(width, height)
+                        if self.output_scale != 1.0:
+                            if self._rgb_full is None or self._rgb_full.shape[:2] != (height, width):
+                                self._rgb_full = np.empty((height, width, 3), dtype=np.uint8)
+                            _bgra_to_rgb(screenshot, out=self._rgb_full)
+                            cv2.resize(
+                                self._rgb_full,
+                                self._scaled_size(width, height),
+                                dst=self._ring[write_idx],
+                                interpolation=cv2.INTER_AREA,
+                            )
+                        else:
+                            _bgra_to_rgb(screenshot, out=self._ring[write_idx])
+                        self._publish(write_idx)
                 except Exception as e:
                     # Log error but continue monitoring
                     print(f"Capture error in monitoring loop: {e}")
@@ -222,6 +394,81 @@ class ScreenCaptureService:
         finally:
             # Clean up thread-local MSS instance
             thread_sct.close()
+            if camera is not None:
+                camera.release()
+
+    def _create_dxgi_camera(self):
+        """
+        Create a DXGI capture camera for the selected monitor, if possible.
+
+        Returns:
+            dxcam camera, or None to capture with MSS
+        """
+        if not DXCAM_AVAILABLE or self._capture_monitor is None:
+            return None
+
+        try:
+            return dxcam.create(output_idx=self._capture_monitor, output_color="RGB")
+        except Exception as e:
+            print(f"DXGI capture unavailable, using MSS: {e}")
+            return None
+
+    def _scaled_size(self, width: int, height: int) -> Tuple[int, int]:
+        """
+        Get the output frame size for a capture size.
+
+        Args:
+            width: Captured width in pixels
+            height: Captured height in pixels
+
+        Returns:
+            (width, height) after applying output_scale
+        """
+        return (
+            max(1, round(width * self.output_scale)),
+            max(1, round(height * self.output_scale)),
+        )
+
+    def _next_slot(self, width: int, height: int) -> int:
+        """
+        Get the ring slot to write the next frame into.
+
+        Args:
+            width: Captured width in pixels
+            height: Captured height in pixels
+
+        Returns:
+            Index of the slot after the published one
+        """
+        out_width, out_height = self._scaled_size(width, height)
+        shape = (out_height, out_width, 3)
+
+        # (Re)allocate the ring only when the output size changes; readers
+        # holding old views keep the old arrays alive
+        if shape != self._ring_shape:
+            self._ring = [np.empty(shape, dtype=np.uint8) for _ in range(_RING_SLOTS)]
+            self._ring_views = []
+            for slot in self._ring:
+                view = slot.view()
+                view.flags.writeable = False
+                self._ring_views.append(view)
+            self._ring_shape = shape
+            self._write_idx = -1
+
+        return (self._write_idx + 1) % _RING_SLOTS
+
+    def _publish(self, write_idx: int) -> None:
+        """
+        Make a fully written ring slot the latest frame.
+
+        Args:
+            write_idx: Slot index
+        """
+        self._write_idx = write_idx
+        # Frame first, then the counter: a reader that sees the new seq is
+        # guaranteed to read this slot, so its lap check covers it
+        self._latest = self._ring_views[write_idx]
+        self._seq += 1
 
     def __del__(self):
         """Cleanup on deletion."""
@@ -1,12 +1,26 @@
 """Session persistence service for saving and loading golf rounds."""
-import json
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+import numpy as np
+
+from src.lib import json_io
 from src.lib.exceptions import ServiceError
 from src.models.session import Session
 from src.models.shot_event import ShotEvent
 
+# Sidecar file holding one summary row per session plus running totals, so
+# listing sessions and aggregate stats don't have to open every session file
+_INDEX_FILENAME = "_index.json"
+
+# Per-session (shots, cost) record used when totalling summary rows
+_TOTALS_DTYPE = np.dtype([("shots", np.int64), ("cost", np.float64)])
+
+# Quiet period before a scheduled save is written, so a burst of
+# shot-by-shot saves collapses into one write of the latest state
+_SAVE_DEBOUNCE_SECONDS = 0.2
+
 
 class SessionService:
     """
@@ -25,6 +39,21 @@ class SessionService:
         self.sessions_dir = Path(sessions_dir)
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
 
+        # Summary index: parsed rows cached in memory, reloaded only when
+        # the index file's mtime changes
+        self.index_file = self.sessions_dir / _INDEX_FILENAME
+        self._index_lock = threading.Lock()
+        self._index: Optional[Dict[str, dict]] = None
+        self._stats: dict = self._totals({})
+        self._index_mtime: Optional[int] = None
+
+        # Sessions waiting on the background writer (latest state per id)
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[str, Session] = {}
+        self._save_requested = threading.Event()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
     def save_session(self, session: Session) -> None:
         """
         Save session to disk.
@@ -35,6 +64,10 @@ class SessionService:
         Raises:
             ServiceError: If save fails
         """
+        # Written now, so a scheduled save of it is no longer needed
+        with self._pending_lock:
+            self._pending.pop(session.id, None)
+
         try:
             session_file = self.sessions_dir / f"{session.id}.json"
 
@@ -46,13 +79,93 @@ class SessionService:
                 shot.to_dict() for shot in session.shot_events
             ]
 
-            # Write to file
-            with open(session_file, "w") as f:
-                json.dump(session_data, f, indent=2)
+            data = json_io.dumps(session_data, indent=True)
+
+            # Under the index lock so the background writer and a direct
+            # save never share the temp file
+            with self._index_lock:
+                # Write to file (atomically, so a crash can't truncate it)
+                json_io.atomic_write_bytes(session_file, data)
+
+                # Update summary row and running totals
+                index = self._read_index()
+                row = self._summarize(session_data)
+                stats = self._adjust_stats(self._stats, index.get(session.id), row)
+                index[session.id] = row
+                self._write_index(index, stats)
 
         except Exception as e:
             raise ServiceError(f"Failed to save session: {e}")
 
+    def schedule_save(self, session: Session) -> None:
+        """
+        Save session in the background after a short debounce.
+
+        Repeated calls within the debounce window result in a single write
+        of the session's latest state. Use flush() or close() to write
+        immediately.
+
+        Args:
+            session: Session to save
+        """
+        if self._closed.is_set():
+            self.save_session(session)
+            return
+
+        with self._pending_lock:
+            self._pending[session.id] = session
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer_thread.start()
+
+        self._save_requested.set()
+
+    def flush(self) -> None:
+        """
+        Write any scheduled saves now.
+
+        Raises:
+            ServiceError: If a save fails (the session stays scheduled)
+        """
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+
+        for i, session in enumerate(pending):
+            try:
+                self.save_session(session)
+            except ServiceError:
+                with self._pending_lock:
+                    for unsaved in pending[i:]:
+                        self._pending.setdefault(unsaved.id, unsaved)
+                raise
+
+    def close(self) -> None:
+        """Stop the background writer and write any scheduled saves."""
+        self._closed.set()
+        self._save_requested.set()
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._writer_thread.join(timeout=2.0)
+        self.flush()
+
+    def _writer_loop(self) -> None:
+        """Background thread: coalesce bursts of saves into one write."""
+        while not self._closed.is_set():
+            self._save_requested.wait()
+            if self._closed.is_set():
+                break
+
+            # Wait out the debounce window (close() cuts it short)
+            if self._closed.wait(_SAVE_DEBOUNCE_SECONDS):
+                break
+            self._save_requested.clear()
+
+            try:
+                self.flush()
+            except ServiceError:
+                # Non-critical: retried on the next scheduled save or close()
+                pass
+
     def load_session(self, session_id: str) -> Optional[Session]:
         """
         Load session from disk.
@@ -72,8 +185,7 @@ class SessionService:
             if not session_file.exists():
                 return None
 
-            with open(session_file, "r") as f:
-                session_data = json.load(f)
+            session_data = json_io.loads(session_file.read_bytes())
 
             # Load shot events (without screenshots)
             shot_events = [
@@ -93,29 +205,13 @@ class SessionService:
         """
         List all saved sessions.
 
+        Reads the summary index rather than every session file.
+
         Returns:
             List of session summaries (id, start_time, total_shots)
         """
-        sessions = []
-
-        for session_file in self.sessions_dir.glob("*.json"):
-            try:
-                with open(session_file, "r") as f:
-                    data = json.load(f)
-
-                sessions.append(
-                    {
-                        "id": data["id"],
-                        "start_time": data["start_time"],
-                        "end_time": data.get("end_time"),
-                        "personality_name": data.get("personality_name", "unknown"),
-                        "total_shots": data.get("total_shots", 0),
-                        "total_cost": data.get("total_cost", 0.0),
-                    }
-                )
-            except Exception:
-                # Skip invalid files
-                continue
+        with self._index_lock:
+            sessions = [dict(row) for row in self._read_index().values()]
 
         # Sort by start time (most recent first)
         sessions.sort(key=lambda x: x["start_time"], reverse=True)
@@ -136,10 +232,158 @@ class SessionService:
 
         if session_file.exists():
             session_file.unlink()
+
+            with self._index_lock:
+                index = self._read_index()
+                row = index.pop(session_id, None)
+                if row is not None:
+                    self._write_index(index, self._adjust_stats(self._stats, row, None))
+
             return True
 
         return False
 
+    def rebuild_index(self) -> None:
+        """Rebuild the summary index by scanning every session file."""
+        with self._index_lock:
+            index = self._scan_sessions()
+            self._write_index(index, self._totals(index))
+
+    def _scan_sessions(self) -> Dict[str, dict]:
+        """
+        Summarize every session file on disk.
+
+        Returns:
+            Dictionary of session id -> summary
+        """
+        index = {}
+
+        for session_file in self.sessions_dir.glob("*.json"):
+            if session_file.name.startswith("_"):
+                continue
+            try:
+                data = json_io.loads(session_file.read_bytes())
+                index[data["id"]] = self._summarize(data)
+            except Exception:
+                # Skip invalid files
+                continue
+
+        return index
+
+    def _read_index(self) -> Dict[str, dict]:
+        """
+        Get the summary index, from memory if the file is unchanged.
+
+        Caller holds the index lock. A missing or unreadable index is
+        rebuilt from the session files.
+
+        Returns:
+            Dictionary of session id -> summary
+        """
+        try:
+            mtime = self.index_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        if self._index is not None and mtime == self._index_mtime:
+            return self._index
+
+        if mtime is not None:
+            try:
+                data = json_io.loads(self.index_file.read_bytes())
+                self._index = data["sessions"]
+                self._stats = data.get("stats") or self._totals(self._index)
+                self._index_mtime = mtime
+                return self._index
+            except Exception:
+                # Corrupt index: fall through to a rebuild
+                pass
+
+        index = self._scan_sessions()
+        self._write_index(index, self._totals(index))
+        return self._index
+
+    def _write_index(self, index: Dict[str, dict], stats: dict) -> None:
+        """
+        Write the summary index and cache it (caller holds the index lock).
+
+        Args:
+            index: Dictionary of session id -> summary
+            stats: Running totals for the index header
+        """
+        json_io.atomic_write_bytes(
+            self.index_file, json_io.dumps({"stats": stats, "sessions": index})
+        )
+        self._index = index
+        self._stats = stats
+        self._index_mtime = self.index_file.stat().st_mtime_ns
+
+    @staticmethod
+    def _totals(index: Dict[str, dict]) -> dict:
+        """
+        Compute running totals from scratch.
+
+        Args:
+            index: Dictionary of session id -> summary
+
+        Returns:
+            Dict with total_sessions, total_shots, total_cost
+        """
+        # One pass over the rows into a structured array, summed in C
+        totals = np.fromiter(
+            ((row["total_shots"], row["total_cost"]) for row in index.values()),
+            dtype=_TOTALS_DTYPE,
+            count=len(index),
+        )
+        return {
+            "total_sessions": len(index),
+            "total_shots": int(totals["shots"].sum()),
+            "total_cost": float(totals["cost"].sum()),
+        }
+
+    @staticmethod
+    def _adjust_stats(stats: dict, old_row: Optional[dict], new_row: Optional[dict]) -> dict:
+        """
+        Apply one summary row change to the running totals.
+
+        Args:
+            stats: Current totals
+            old_row: Row being replaced or removed (None if new)
+            new_row: Row being added (None if removed)
+
+        Returns:
+            New totals
+        """
+        adjusted = dict(stats)
+        for row, sign in ((old_row, -1), (new_row, 1)):
+            if row is None:
+                continue
+            adjusted["total_sessions"] += sign
+            adjusted["total_shots"] += sign * row["total_shots"]
+            adjusted["total_cost"] += sign * row["total_cost"]
+        return adjusted
+
+    @staticmethod
+    def _summarize(data: dict) -> dict:
+        """
+        Build the summary row for a session.
+
+        Args:
+            data: Session dictionary (as saved)
+
+        Returns:
+            Summary dict (id, start_time, end_time, personality_name,
+            total_shots, total_cost)
+        """
+        return {
+            "id": data["id"],
+            "start_time": data["start_time"],
+            "end_time": data.get("end_time"),
+            "personality_name": data.get("personality_name", "unknown"),
+            "total_shots": data.get("total_shots", 0),
+            "total_cost": data.get("total_cost", 0.0),
+        }
+
     def get_session_stats(self) -> dict:
         """
         Get aggregate statistics across all sessions.
@@ -147,11 +391,13 @@ class SessionService:
         Returns:
             Dictionary with total sessions, shots, cost, etc.
         """
-        sessions = self.list_sessions()
+        with self._index_lock:
+            self._read_index()
+            stats = self._stats
 
-        total_sessions = len(sessions)
-        total_shots = sum(s["total_shots"] for s in sessions)
-        total_cost = sum(s["total_cost"] for s in sessions)
+        total_sessions = stats["total_sessions"]
+        total_shots = stats["total_shots"]
+        total_cost = stats["total_cost"]
 
         return {
             "total_sessions": total_sessions,
@@ -1,14 +1,23 @@
 """Voice service for text-to-speech using xAI Grok TTS API."""
+import hashlib
 import io
 import os
+import queue
+import re
+import shutil
+import subprocess
 import sys
 import tempfile
 import threading
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
-from openai import OpenAI
+import httpx
 
 from src.lib.exceptions import VoiceServiceError
+from src.lib.json_io import atomic_write_bytes
 
 # Platform-specific volume control
 if sys.platform == 'win32':
@@ -28,11 +37,75 @@ try:
 except ImportError:
     PYGAME_AVAILABLE = False
 
+# ffplay (FFmpeg) can play MP3 from stdin as it downloads; when installed,
+# speech starts after the first chunk instead of after the whole file
+FFPLAY_PATH = shutil.which("ffplay")
+
+# Tells a speech worker to exit once it has finished its current utterance
+_STOP_WORKER = object()
+
+# HTTP statuses meaning the key can't use TTS (unauthorized, out of
+# credits, no access); speech is skipped instead of raising
+_NO_TTS_ACCESS = frozenset({401, 402, 403})
+
+# Sentence boundary in streamed text: terminal punctuation, then whitespace
+# (so decimals like "3.5" never split). Short fragments and abbreviations
+# are held back and joined with what follows.
+_SENTENCE_END = re.compile(r"[.!?]+\s+")
+_ABBREVIATIONS = ("Dr.", "Mr.", "Mrs.", "Ms.", "St.", "Jr.", "Sr.", "vs.")
+_MIN_SENTENCE_CHARS = 10
+
+
+def _iter_sentences(chunks: Iterable[str]) -> Iterator[str]:
+    # Regroup arbitrary text chunks (e.g. LLM tokens) into whole sentences.
+    # Each character is scanned once: the search resumes where the last one
+    # stopped, backing up only over trailing punctuation that may yet turn
+    # into a sentence end.
+    buffer = ""
+    scan_from = 0
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        scan_end = scan_from
+        for match in _SENTENCE_END.finditer(buffer, scan_from):
+            scan_end = match.end()
+            sentence = buffer[start:match.end()].strip()
+            if len(sentence) < _MIN_SENTENCE_CHARS:
+                continue
+            if buffer.endswith(_ABBREVIATIONS, start, match.start() + 1):
+                continue
+            yield sentence
+            start = match.end()
+
+        scan_from = len(buffer)
+        while scan_from > scan_end and buffer[scan_from - 1] in ".!?":
+            scan_from -= 1
+        scan_from -= start
+        buffer = buffer[start:]
+
+    tail = buffer.strip()
+    if tail:
+        yield tail
+
+
+def _tee(chunks, sink: list):
+    # Yield chunks unchanged while also collecting them into sink
+    for chunk in chunks:
+        sink.append(chunk)
+        yield chunk
+
 
 class VoiceService:
     """Voice service using xAI Grok TTS API."""
 
     AVAILABLE_VOICES = ["eve", "ara", "rex", "sal", "leo"]
+    # xAI Grok TTS: $4.20 per 1M characters
+    _COST_PER_CHAR = 4.20 / 1_000_000
+    # Built once: Grok TTS voices are a fixed set, so there is nothing to fetch
+    _VOICE_INFO = tuple(
+        {"id": v, "name": v.capitalize(), "category": "standard"}
+        for v in AVAILABLE_VOICES
+    )
 
     def __init__(
         self,
@@ -40,47 +113,175 @@ class VoiceService:
         voice_id: str = "leo",
         model: str = "grok-tts-preview",
         volume_boost: float = 0.0,
+        cache_dir: Optional[str] = "data/tts_cache",
+        cache_max_bytes: int = 500 * 1024 * 1024,
+        cache_ttl: Optional[float] = 30 * 24 * 3600.0,
+        synthesis_concurrency: int = 3,
+        prebuffer_bytes: int = 12 * 1024,
         **kwargs,  # Absorb legacy ElevenLabs params (stability, similarity_boost, etc.)
     ):
-        self.client = OpenAI(
-            api_key=api_key,
+        # Persistent HTTP client for the TTS endpoint: keeps the TLS
+        # connection alive between utterances (commentary is minutes apart
+        # at most) and fails fast if the API is unreachable
+        self._http = httpx.Client(
             base_url="https://api.x.ai/v1",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=httpx.Timeout(30.0, connect=3.0),
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300.0),
         )
         self.voice_id = voice_id
         self.model = model
         self.volume_boost = volume_boost
-        self.current_thread: Optional[threading.Thread] = None
-        self.is_speaking = False
-        self.should_stop = False
+        # Sentences speak_iter synthesizes ahead of the one playing
+        self.synthesis_concurrency = synthesis_concurrency
+        # Audio held back before streamed playback starts (~0.5-1s of MP3),
+        # so a slow chunk right after the first doesn't stall the player
+        self.prebuffer_bytes = prebuffer_bytes
+        # One long-lived worker speaks queued text (started on first use).
+        # Each worker has its own queue; stop() detaches both, so the next
+        # speak() starts a fresh worker even if the old one is still busy
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        # Set while speech is claimed or playing; the lock makes claiming
+        # (_claim_speaker), releasing, and stop()'s reset atomic
+        self._state_lock = threading.Lock()
+        self._speaking = threading.Event()
+        # Bumped by every claim and by stop(); an utterance owns the speaker
+        # only while the token it claimed is still current
+        self._speaker_token = 0
+        # Token of the utterance the current thread is speaking
+        self._local = threading.local()
+        # External player process while one is playing, so stop() can
+        # kill it instead of waiting for the worker to notice
+        self._player: Optional[subprocess.Popen] = None
+
+        # Disk cache of synthesized audio: repeated lines ("Nice shot!") are
+        # played from disk instead of being re-synthesized and re-billed
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_max_bytes = cache_max_bytes
+        # Entries unused for this many seconds are re-synthesized (None = keep)
+        self.cache_ttl = cache_ttl
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._prune_cache()
 
         if PYGAME_AVAILABLE and not pygame.mixer.get_init():
             pygame.mixer.pre_init(44100, -16, 2, 2048)
             pygame.mixer.init()
 
+    @property
+    def voice_id(self) -> str:
+        return self._voice_id
+
+    @voice_id.setter
+    def voice_id(self, voice_id: str) -> None:
+        # Prebuild the voice-specific part of every /tts request body
+        self._voice_id = voice_id
+        self._tts_params = {"voice_id": voice_id, "language": "en"}
+
+    @property
+    def is_speaking(self) -> bool:
+        return self._speaking.is_set()
+
+    @property
+    def should_stop(self) -> bool:
+        # True once the utterance this thread is speaking was stopped or
+        # superseded, so a newer utterance can't revive an older one
+        return getattr(self._local, "token", None) != self._speaker_token
+
     def speak(self, text: str, blocking: bool = False) -> bool:
-        if self.is_speaking:
+        # Claim the speaker before anything else so a second call can't
+        # slip in before this one starts playing
+        token = self._claim_speaker()
+        if token is None:
             return False
 
         if blocking:
-            self._speak_sync(text)
-        else:
-            self.current_thread = threading.Thread(
-                target=self._speak_sync,
-                args=(text,),
-                daemon=True,
-            )
-            self.current_thread.start()
+            self._speak_sync(text, token)
+            return True
+
+        # The claim above keeps at most one utterance queued, so the queue
+        # needs no bound
+        with self._state_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._queue = queue.Queue()
+                self._worker = threading.Thread(
+                    target=self._run_worker, args=(self._queue,), daemon=True
+                )
+                self._worker.start()
+            self._queue.put((token, text))
 
         return True
 
-    def speak_streaming(self, text: str) -> None:
+    def speak_streaming(self, text: str) -> bool:
+        token = self._claim_speaker()
+        if token is None:
+            return False
+
+        self._local.token = token
         try:
-            self.is_speaking = True
             self._generate_and_play(text)
-            self.is_speaking = False
         except Exception as e:
-            self.is_speaking = False
             raise VoiceServiceError(f"Failed to stream TTS audio: {e}")
+        finally:
+            self._release_speaker(token)
+
+        return True
+
+    def speak_iter(self, text_chunks: Iterable[str]) -> bool:
+        # Speak text as it is generated. Sentences are synthesized in
+        # parallel (up to synthesis_concurrency at once) while the caller's
+        # thread plays them back in order. Blocks until done; returns False
+        # without speaking if something else is already speaking.
+        token = self._claim_speaker()
+        if token is None:
+            return False
+
+        pending: queue.Queue = queue.Queue()
+        finished = threading.Event()
+        errors = []
+        executor = ThreadPoolExecutor(max_workers=max(1, self.synthesis_concurrency))
+
+        def split() -> None:
+            try:
+                for sentence in _iter_sentences(text_chunks):
+                    if finished.is_set() or self._speaker_token != token:
+                        break
+                    pending.put(executor.submit(self._synthesize, sentence))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                pending.put(_STOP_WORKER)
+
+        previous_volume = None
+        self._local.token = token
+        try:
+            previous_volume = self._set_system_volume(self.volume_boost)
+
+            threading.Thread(target=split, daemon=True).start()
+            while True:
+                future = pending.get()
+                if future is _STOP_WORKER or self.should_stop:
+                    break
+                audio_bytes = future.result()
+                if self.should_stop:
+                    break
+                self._play_audio(audio_bytes)
+        except Exception as e:
+            raise VoiceServiceError(f"Failed to stream TTS audio: {e}")
+        finally:
+            finished.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._restore_system_volume(previous_volume)
+            self._release_speaker(token)
+
+        if errors:
+            raise VoiceServiceError(f"Failed to read text stream: {errors[0]}")
+
+        return True
 
     def update_voice(
         self,
@@ -91,8 +292,19 @@ class VoiceService:
             self.voice_id = voice_id
 
     def stop(self) -> None:
-        self.should_stop = True
-        self.is_speaking = False
+        with self._state_lock:
+            # Invalidate the current utterance's token: it stops at its next
+            # should_stop check and its release becomes a no-op
+            self._speaker_token += 1
+            self._speaking.clear()
+            worker_queue = self._queue
+            self._queue = None
+            self._worker = None
+
+        # The old worker may be stuck in a TTS request for a while; it skips
+        # anything still queued (its token is stale) and then exits
+        if worker_queue is not None:
+            worker_queue.put(_STOP_WORKER)
 
         if PYGAME_AVAILABLE:
             try:
@@ -100,26 +312,50 @@ class VoiceService:
             except Exception:
                 pass
 
-        if self.current_thread and self.current_thread.is_alive():
-            self.current_thread.join(timeout=2.0)
+        player = self._player
+        if player is not None and player.poll() is None:
+            try:
+                player.terminate()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        # Stop speaking and release the pooled HTTP connections
+        self.stop()
+        self._http.close()
 
     def save_audio(self, text: str, file_path: str) -> None:
         try:
-            response = self.client.audio.speech.create(
-                model=self.model,
-                voice=self.voice_id,
-                input=text,
-            )
-            with open(file_path, "wb") as f:
-                f.write(response.content)
+            cache_file = self._cache_path(text)
+            audio_bytes = self._load_cached_audio(cache_file)
+            if audio_bytes:
+                Path(file_path).write_bytes(audio_bytes)
+                return
+
+            # Write chunks as they download instead of holding the whole file
+            with self._http.stream(
+                "POST",
+                "/tts",
+                json={"text": text, **self._tts_params},
+            ) as response:
+                response.raise_for_status()
+                # Keep the chunks too when caching, so speaking this line
+                # later doesn't pay for synthesis again
+                received = [] if cache_file is not None else None
+                chunks = response.iter_bytes()
+                if received is not None:
+                    chunks = _tee(chunks, received)
+                with open(file_path, "wb", buffering=64 * 1024) as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+
+            if received is not None:
+                self._store_cached_audio(cache_file, b"".join(received))
         except Exception as e:
             raise VoiceServiceError(f"Failed to save TTS audio: {e}")
 
     def list_voices(self) -> list:
-        return [
-            {"id": v, "name": v.capitalize(), "category": "standard"}
-            for v in self.AVAILABLE_VOICES
-        ]
+        return list(self._VOICE_INFO)
 
     def set_voice(self, voice_id: str) -> None:
         self.voice_id = voice_id
@@ -129,34 +365,171 @@ class VoiceService:
         pass
 
     def estimate_cost(self, text: str) -> float:
-        # xAI Grok TTS: $4.20 per 1M characters
-        return (len(text) / 1_000_000) * 4.20
+        return len(text) * self._COST_PER_CHAR
 
     def _generate_and_play(self, text: str) -> None:
-        # Use direct API call to xAI's TTS endpoint instead of OpenAI SDK
-        import httpx
+        if not FFPLAY_PATH:
+            self._play_audio(self._synthesize(text))
+            return
 
-        response = httpx.post(
-            "https://api.x.ai/v1/tts",
-            headers={
-                "Authorization": f"Bearer {self.client.api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "text": text,
-                "voice_id": self.voice_id,
-                "language": "en"
-            },
-            timeout=30.0
+        cache_file = self._cache_path(text)
+        audio_bytes = self._load_cached_audio(cache_file)
+        if audio_bytes:
+            self._play_audio(audio_bytes)
+            return
+
+        # Direct API call to xAI's TTS endpoint
+        with self._http.stream(
+            "POST",
+            "/tts",
+            json={"text": text, **self._tts_params},
+        ) as response:
+            response.raise_for_status()
+
+            # Keep the chunks so the complete audio can be cached
+            received = []
+            if self._play_stream_with_ffplay(_tee(response.iter_bytes(), received)):
+                self._store_cached_audio(cache_file, b"".join(received))
+
+    def _synthesize(self, text: str) -> bytes:
+        # Complete audio for text, from the cache or the API
+        cache_file = self._cache_path(text)
+        audio_bytes = self._load_cached_audio(cache_file)
+        if audio_bytes:
+            return audio_bytes
+
+        response = self._http.post(
+            "/tts",
+            json={"text": text, **self._tts_params},
         )
         response.raise_for_status()
         audio_bytes = response.content
 
+        self._store_cached_audio(cache_file, audio_bytes)
+        return audio_bytes
+
+    def _play_audio(self, audio_bytes: bytes) -> None:
         if PYGAME_AVAILABLE:
             self._play_with_pygame(audio_bytes)
+        elif FFPLAY_PATH:
+            self._play_stream_with_ffplay([audio_bytes])
         else:
             self._play_with_tempfile(audio_bytes)
 
+    def _cache_path(self, text: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha256(f"{text}|{self.voice_id}|{self.model}|en".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.mp3"
+
+    def _load_cached_audio(self, cache_file: Optional[Path]) -> Optional[bytes]:
+        if cache_file is None:
+            return None
+        try:
+            if self.cache_ttl is not None and time.time() - cache_file.stat().st_mtime > self.cache_ttl:
+                return None
+            audio_bytes = cache_file.read_bytes()
+            os.utime(cache_file)  # Mark as recently used
+        except OSError:
+            return None
+        return audio_bytes
+
+    def _store_cached_audio(self, cache_file: Optional[Path], audio_bytes: bytes) -> None:
+        if cache_file is None or not audio_bytes:
+            return
+        try:
+            atomic_write_bytes(cache_file, audio_bytes)
+        except OSError:
+            # Caching is best-effort
+            pass
+
+    def _prune_cache(self) -> None:
+        # Drop entries past their TTL, then evict least recently used files
+        # until the cache fits its size cap
+        try:
+            entries = [(f.stat(), f) for f in self.cache_dir.glob("*.mp3")]
+        except OSError:
+            return
+
+        if self.cache_ttl is not None:
+            expires_before = time.time() - self.cache_ttl
+            fresh = []
+            for st, cache_file in entries:
+                if st.st_mtime >= expires_before:
+                    fresh.append((st, cache_file))
+                    continue
+                try:
+                    cache_file.unlink()
+                except OSError:
+                    pass
+            entries = fresh
+
+        total = sum(st.st_size for st, _ in entries)
+        if total <= self.cache_max_bytes:
+            return
+
+        entries.sort(key=lambda entry: entry[0].st_mtime)
+        for st, cache_file in entries:
+            if total <= self.cache_max_bytes:
+                break
+            try:
+                cache_file.unlink()
+                total -= st.st_size
+            except OSError:
+                pass
+
+    def _play_stream_with_ffplay(self, chunks) -> bool:
+        # Feed audio chunks to ffplay as they arrive from the API. Returns
+        # True only if every chunk was read and handed to the player, i.e.
+        # the audio is complete (not stopped, player didn't exit early)
+        consumed = False
+        proc = subprocess.Popen(
+            [FFPLAY_PATH, "-nodisp", "-autoexit", "-loglevel", "quiet", "-i", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._player = proc
+        try:
+            # ffplay starts up while the first chunks are being buffered
+            prebuffer = bytearray()
+            for chunk in chunks:
+                if self.should_stop:
+                    break
+                if prebuffer is not None:
+                    prebuffer += chunk
+                    if len(prebuffer) < self.prebuffer_bytes:
+                        continue
+                    chunk, prebuffer = prebuffer, None
+                proc.stdin.write(chunk)
+            if self.should_stop:
+                return False
+            if prebuffer:
+                proc.stdin.write(prebuffer)
+            consumed = True
+            proc.stdin.close()
+
+            while proc.poll() is None:
+                if self.should_stop:
+                    break
+                time.sleep(0.1)
+        except (BrokenPipeError, OSError):
+            # Player exited early
+            pass
+        finally:
+            if proc.poll() is None:
+                if self.should_stop:
+                    proc.terminate()
+                else:
+                    # Download failed midway: let ffplay finish what it has
+                    try:
+                        proc.stdin.close()
+                    except OSError:
+                        pass
+            proc.wait()
+            self._player = None
+        return consumed
+
     def _play_with_pygame(self, audio_bytes: bytes) -> None:
         audio_io = io.BytesIO(audio_bytes)
         pygame.mixer.music.load(audio_io)
@@ -171,20 +544,26 @@ class VoiceService:
 
     def _play_with_tempfile(self, audio_bytes: bytes) -> None:
         # Fallback: write to temp file and use subprocess
-        import subprocess
         with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
             f.write(audio_bytes)
             temp_path = f.name
         try:
             if sys.platform == "win32":
-                subprocess.run(
+                proc = subprocess.Popen(
                     ["powershell", "-c",
                      f"Add-Type -AssemblyName presentationCore; "
                      f"$mp = [System.Windows.Media.MediaPlayer]::new(); "
                      f"$mp.Open([Uri]::new('{temp_path}')); "
                      f"$mp.Play(); Start-Sleep -s 10"],
-                    check=False, timeout=30,
                 )
+                self._player = proc
+                try:
+                    proc.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+                finally:
+                    self._player = None
         finally:
             try:
                 os.unlink(temp_path)
@@ -228,24 +607,54 @@ class VoiceService:
         except Exception:
             pass
 
-    def _speak_sync(self, text: str) -> None:
+    def _claim_speaker(self) -> Optional[int]:
+        # Atomically check-and-set the speaking flag; returns the claim's
+        # token, or None if the speaker is already taken
+        with self._state_lock:
+            if self._speaking.is_set():
+                return None
+            self._speaker_token += 1
+            self._speaking.set()
+            return self._speaker_token
+
+    def _release_speaker(self, token: int) -> None:
+        # Only the current owner may release; a claim invalidated by stop()
+        # must not clear a newer utterance's claim
+        with self._state_lock:
+            if token == self._speaker_token:
+                self._speaking.clear()
+
+    def _run_worker(self, work_queue: queue.Queue) -> None:
+        while True:
+            item = work_queue.get()
+            if item is _STOP_WORKER:
+                break
+            token, text = item
+            try:
+                self._speak_sync(text, token)
+            except VoiceServiceError as e:
+                print(f"  Voice error: {e}")
+
+    def _speak_sync(self, text: str, token: int) -> None:
+        # The caller has already claimed the speaker with this token
+        self._local.token = token
+        if self.should_stop:
+            return  # Stopped while queued
+
         previous_volume = None
         try:
-            self.is_speaking = True
-            self.should_stop = False
             previous_volume = self._set_system_volume(self.volume_boost)
 
             self._generate_and_play(text)
 
             self._restore_system_volume(previous_volume)
-            self.is_speaking = False
+            self._release_speaker(token)
 
         except Exception as e:
             self._restore_system_volume(previous_volume)
-            self.is_speaking = False
+            self._release_speaker(token)
 
-            error_str = str(e)
-            if "401" in error_str or "403" in error_str or "quota" in error_str.lower() or "insufficient_quota" in error_str or "not authorized" in error_str.lower():
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code in _NO_TTS_ACCESS:
                 print("  ⚠️  xAI TTS error - skipping voice synthesis")
                 print("  💡 Voice requires TTS access at console.x.ai")
                 print("  💡 Check if your plan includes Grok TTS or request beta access")
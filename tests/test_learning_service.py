@@ -1,7 +1,5 @@
 """Unit tests for LearningService."""
-import tempfile
 from datetime import datetime
-from pathlib import Path
 
 import pytest
 
@@ -11,17 +9,15 @@ from src.services.learning_service import LearningService
 
 
 @pytest.fixture
-def learning_service():
+def learning_service(tmp_path):
     """Create a temporary learning service for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        corrections_file = Path(tmpdir) / "corrections.json"
-        examples_file = Path(tmpdir) / "examples.json"
-        service = LearningService(
-            corrections_file=str(corrections_file),
-            examples_file=str(examples_file),
-            max_examples_per_outcome=5,
-        )
-        yield service
+    service = LearningService(
+        corrections_file=str(tmp_path / "corrections.json"),
+        examples_file=str(tmp_path / "examples.json"),
+        max_examples_per_outcome=5,
+    )
+    yield service
+    service.close()
 
 
 def test_learning_service_initialization(learning_service):
@@ -91,6 +87,10 @@ def test_get_corrections_for_outcome(learning_service):
     green_corrections = learning_service.get_corrections_for_outcome(Outcome.GREEN)
     assert len(green_corrections) == 2
 
+    # Cleared corrections drop out of the filter too
+    learning_service.clear_corrections()
+    assert learning_service.get_corrections_for_outcome(Outcome.GREEN) == []
+
 
 def test_add_few_shot_example(learning_service):
     """Test adding few-shot examples."""
@@ -241,7 +241,8 @@ def test_persistence(learning_service):
         confidence=1.0,
     )
 
-    # Files are auto-saved, create new instance
+    # Writes are debounced; flush before creating new instance
+    learning_service.flush()
     new_service = LearningService(
         corrections_file=str(learning_service.corrections_file),
         examples_file=str(learning_service.examples_file),
@@ -250,3 +251,23 @@ def test_persistence(learning_service):
     # Should have loaded data
     assert len(new_service.corrections) == 1
     assert len(new_service.few_shot_examples) >= 1
+
+
+def test_corrections_load_legacy_json_and_log(learning_service):
+    """Test that corrections from the old JSON file and the JSONL log are merged."""
+    learning_service.corrections_file.write_text(
+        '{"corrections": [{"original_outcome": "bunker", '
+        '"corrected_outcome": "fairway", "timestamp": "2024-01-01T00:00:00"}]}'
+    )
+    learning_service.corrections_log.write_text(
+        '{"original_outcome": "water", "corrected_outcome": "rough", '
+        '"timestamp": "2024-01-01T00:01:00"}\n{"truncated'
+    )
+
+    new_service = LearningService(
+        corrections_file=str(learning_service.corrections_file),
+        examples_file=str(learning_service.examples_file),
+    )
+
+    assert [c["corrected_outcome"] for c in new_service.corrections] == ["fairway", "rough"]
+    new_service.close()
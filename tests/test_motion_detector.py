@@ -0,0 +1,31 @@
+"""Unit tests for MotionDetectorService."""
+import numpy as np
+import pytest
+
+from src.services.motion_detector import MotionDetectorService
+
+
+def _frame(fill: int = 100) -> np.ndarray:
+    """Create a flat gray RGB frame."""
+    return np.full((64, 64, 3), fill, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("downsample", [1, 4])
+def test_thin_faint_feature_detected(downsample):
+    """Test that a one-pixel-wide, faint moving feature trips detection at any scale."""
+    detector = MotionDetectorService(threshold=0.005, downsample=downsample)
+    moved = _frame()
+    moved[16, 8:56] = 160  # 1px line, 60 levels above the background
+
+    assert detector.analyze_frame(_frame()) is False
+    assert detector.analyze_frame(moved) is True
+
+
+def test_pixel_noise_ignored():
+    """Test that low-amplitude pixel noise is not motion at the default scale."""
+    rng = np.random.default_rng(0)
+    detector = MotionDetectorService()
+
+    for _ in range(5):
+        noisy = _frame().astype(np.int16) + rng.integers(-8, 9, (64, 64, 3))
+        assert detector.analyze_frame(noisy.astype(np.uint8)) is False
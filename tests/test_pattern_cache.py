@@ -1,6 +1,5 @@
 """Unit tests for PatternCacheService."""
-import tempfile
-from pathlib import Path
+import time
 
 import numpy as np
 import pytest
@@ -10,18 +9,17 @@ from src.services.pattern_cache import PatternCacheService
 
 
 @pytest.fixture
-def cache_service():
+def cache_service(tmp_path):
     """Create a temporary cache service for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        cache_file = Path(tmpdir) / "test_cache.json"
-        service = PatternCacheService(cache_file=str(cache_file), hamming_threshold=10)
-        yield service
+    return PatternCacheService(cache_file=str(tmp_path / "test_cache.json"), hamming_threshold=10)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_screenshot():
-    """Create a sample screenshot (random RGB image)."""
-    return np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    """Create a sample screenshot (seeded random RGB image), shared read-only."""
+    screenshot = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    screenshot.setflags(write=False)
+    return screenshot
 
 
 def test_cache_service_initialization(cache_service):
@@ -31,17 +29,27 @@ def test_cache_service_initialization(cache_service):
     assert len(cache_service.patterns) == 0
 
 
-def test_add_and_find_pattern(cache_service, sample_screenshot):
+@pytest.mark.parametrize(
+    "outcome,confidence",
+    [
+        (Outcome.FAIRWAY, 0.9),
+        (Outcome.GREEN, 0.85),
+        (Outcome.BUNKER, 0.8),
+        (Outcome.ROUGH, 0.7),
+        (Outcome.TREES, 0.6),
+    ],
+)
+def test_add_and_find_pattern(cache_service, sample_screenshot, outcome, confidence):
     """Test adding a pattern and finding it."""
     # Add pattern
-    cache_service.add_pattern(sample_screenshot, Outcome.FAIRWAY, confidence=0.9)
+    cache_service.add_pattern(sample_screenshot, outcome, confidence=confidence)
 
     # Find exact match
     result = cache_service.find_match(sample_screenshot)
 
     assert result is not None
-    assert result[0] == Outcome.FAIRWAY
-    assert result[1] == 0.9
+    assert result[0] == outcome
+    assert result[1] == confidence
 
 
 def test_find_similar_pattern(cache_service, sample_screenshot):
@@ -60,6 +68,16 @@ def test_find_similar_pattern(cache_service, sample_screenshot):
     assert result[0] == Outcome.GREEN
 
 
+def test_find_match_picks_closest_pattern(cache_service, sample_screenshot):
+    """Test that lookup returns the nearest of several cached patterns."""
+    other = np.random.default_rng(1).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    cache_service.add_pattern(sample_screenshot, Outcome.FAIRWAY, confidence=0.9)
+    cache_service.add_pattern(other, Outcome.WATER, confidence=0.8)
+
+    assert cache_service.find_match(sample_screenshot) == (Outcome.FAIRWAY, 0.9)
+    assert cache_service.find_match(other) == (Outcome.WATER, 0.8)
+
+
 def test_no_match_for_different_screenshot(cache_service, sample_screenshot):
     """Test that completely different screenshots don't match."""
     # Add pattern
@@ -98,6 +116,26 @@ def test_persist_and_load(cache_service, sample_screenshot):
     assert result[0] == Outcome.BUNKER
 
 
+def test_autosave_writes_in_background(tmp_path, sample_screenshot):
+    """Test that pending changes are saved by the background thread and on close."""
+    cache_file = tmp_path / "cache.json"
+    service = PatternCacheService(
+        cache_file=str(cache_file), autosave_interval=0.05, autosave_every=1
+    )
+    service.add_pattern(sample_screenshot, Outcome.ROUGH, confidence=0.8)
+
+    deadline = time.monotonic() + 2.0
+    while not cache_file.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache_file.exists()
+
+    service.update_confidence(sample_screenshot, 0.95)
+    service.close()
+
+    reloaded = PatternCacheService(cache_file=str(cache_file))
+    assert reloaded.find_match(sample_screenshot) == (Outcome.ROUGH, 0.95)
+
+
 def test_get_stats(cache_service, sample_screenshot):
     """Test getting cache statistics."""
     # Initially empty
@@ -145,3 +183,53 @@ def test_clear_cache(cache_service, sample_screenshot):
     assert len(cache_service.patterns) == 0
     result = cache_service.find_match(sample_screenshot)
     assert result is None
+
+
+def test_compute_hash_memoized(cache_service, sample_screenshot):
+    """Test that repeated hashing of the same screenshot reuses the result."""
+    first = cache_service._compute_hash(sample_screenshot)
+
+    assert len(cache_service._hash_memo) == 1
+    assert cache_service._compute_hash(sample_screenshot.copy()) == first
+    assert len(cache_service._hash_memo) == 1
+
+
+def test_compute_hash_memo_distinguishes_frames(cache_service, sample_screenshot):
+    """Test that a frame differing in only a few rows is not served a stale hash."""
+    first = cache_service._compute_hash(sample_screenshot)
+
+    other = sample_screenshot.copy()
+    other[1::32] = 0  # Thin lines the old strided fingerprint never sampled
+
+    assert cache_service._compute_hash(other) == cache_service._phash(other)
+    assert cache_service._compute_hash(other) != first
+    assert len(cache_service._hash_memo) == 2
+
+
+def test_upsert(cache_service, sample_screenshot):
+    """Test upsert adds a new pattern, then updates the matching one."""
+    assert cache_service.upsert(sample_screenshot, Outcome.ROUGH, confidence=0.7) is False
+    assert cache_service.upsert(sample_screenshot, Outcome.FAIRWAY, confidence=0.9) is True
+
+    assert len(cache_service.patterns) == 1
+    assert cache_service.find_match(sample_screenshot) == (Outcome.FAIRWAY, 0.9)
+
+
+def test_eviction_keeps_frequently_hit_patterns(tmp_path):
+    """Test that exceeding max_size evicts stale patterns, not popular ones."""
+    rng = np.random.default_rng(0)
+    screenshots = [rng.integers(0, 255, (64, 64, 3), dtype=np.uint8) for _ in range(11)]
+
+    service = PatternCacheService(
+        cache_file=str(tmp_path / "cache.json"), hamming_threshold=1, max_size=10
+    )
+    for screenshot in screenshots[:10]:
+        service.add_pattern(screenshot, Outcome.FAIRWAY, confidence=0.9)
+    for _ in range(3):
+        service.find_match(screenshots[0])
+
+    service.add_pattern(screenshots[10], Outcome.GREEN, confidence=0.9)
+
+    assert len(service.patterns) == 10
+    assert service.find_match(screenshots[0]) == (Outcome.FAIRWAY, 0.9)
+    assert service.find_match(screenshots[10]) == (Outcome.GREEN, 0.9)
@@ -20,72 +20,216 @@ when to pause commentary and skip analysis to save API costs.
 """
 
 import io
-import json
+import os
 import sys
+import hashlib
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+from src.lib import json_io
 from src.models.outcome import Outcome
 
+# Training folders: one per outcome, plus idle screens (non-gameplay)
+_TRAINING_FOLDERS = tuple(outcome.value for outcome in Outcome) + ("idle",)
 
-def scan_training_images(images_dir: Path) -> Dict[str, List[str]]:
+# Image file extensions (lowercase), matched case-insensitively
+_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+# Bytes of each image read for its content hash; with the file size this
+# identifies an image without reading all of it
+_HASH_PREFIX_BYTES = 64 * 1024
+
+# Folder listings from the last run, reused while a folder's mtime is
+# unchanged (adding, removing or renaming a file updates it)
+SCAN_CACHE_FILE = Path("data/training/.scan_cache.json")
+
+# Bumped whenever the cached image fields change; older caches are ignored
+_SCAN_CACHE_VERSION = 2
+
+# A folder modified this recently may change again within the same mtime
+# tick (2s on FAT), so its listing is not cached
+_MTIME_SETTLE_NS = 2_000_000_000
+
+
+class TrainingImage(NamedTuple):
+    """An image file found by the training scan."""
+
+    path: str
+    mtime_ns: int
+
+
+def _content_hash(path: str) -> str:
     """
-    Scan training images directory and organize by outcome.
+    Identify an image by its content rather than its file name.
 
     Args:
-        images_dir: Path to images directory
+        path: Image file
 
     Returns:
-        Dict mapping outcome to list of image paths
+        16-hex-digit hash of the file's first 64KB and its size
     """
-    images_by_outcome = {}
+    with open(path, "rb") as f:
+        digest = hashlib.blake2b(f.read(_HASH_PREFIX_BYTES), digest_size=8)
+        digest.update(os.fstat(f.fileno()).st_size.to_bytes(8, "little"))
+    return digest.hexdigest()
+
+
+def _scan_image_dir(folder: str) -> List[TrainingImage]:
+    """
+    List image files in one folder with a single directory pass.
+
+    Extensions are matched case-insensitively, so each file is listed once
+    even on case-insensitive filesystems.
+
+    Args:
+        folder: Folder to scan
+
+    Returns:
+        Images with their modification times
+    """
+    with os.scandir(folder) as entries:
+        return [
+            TrainingImage(entry.path, entry.stat().st_mtime_ns)
+            for entry in entries
+            if entry.name.lower().endswith(_IMAGE_EXTENSIONS) and entry.is_file()
+        ]
+
+
+def _scan_cached(
+    folder: os.DirEntry, cached: Optional[Dict]
+) -> Tuple[List[TrainingImage], Optional[Dict]]:
+    """
+    List image files in one folder, reusing the cached listing if unchanged.
 
-    # Valid image extensions
-    valid_extensions = {'.jpg', '.jpeg', '.png', '.bmp'}
+    Args:
+        folder: Folder to scan (entry from the images directory listing)
+        cached: This folder's entry from the last run (mtime_ns, images)
 
-    # Scan each outcome folder
-    for outcome in Outcome:
-        outcome_dir = images_dir / outcome.value
-        if not outcome_dir.exists():
-            continue
+    Returns:
+        Tuple of (images, cache entry for the next run or None).
+        A folder removed since it was listed gives no images.
+    """
+    try:
+        mtime_ns = folder.stat().st_mtime_ns
+    except FileNotFoundError:
+        return [], None
+
+    if cached is not None and cached["mtime_ns"] == mtime_ns:
+        images = cached["images"]
+    else:
+        images = _scan_image_dir(folder.path)
+
+    if time.time_ns() - mtime_ns <= _MTIME_SETTLE_NS:
+        return images, None
+    return images, {"mtime_ns": mtime_ns, "images": images}
+
+
+def _load_scan_cache(cache_file: Optional[Path]) -> Dict[str, Dict]:
+    """Load folder listings from the last run (empty if missing or stale)."""
+    if cache_file is None:
+        return {}
+    try:
+        data = json_io.loads(cache_file.read_bytes())
+        if data.get("version") != _SCAN_CACHE_VERSION:
+            return {}
+        return {
+            folder: {
+                "mtime_ns": entry["mtime_ns"],
+                "images": [TrainingImage(*row) for row in entry["images"]],
+            }
+            for folder, entry in data["folders"].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def _save_scan_cache(cache_file: Path, folders: Dict[str, Dict]) -> None:
+    """Write folder listings for the next run."""
+    data = {
+        "version": _SCAN_CACHE_VERSION,
+        "folders": {
+            folder: {
+                "mtime_ns": entry["mtime_ns"],
+                "images": [list(image) for image in entry["images"]],
+            }
+            for folder, entry in folders.items()
+        },
+    }
+    json_io.atomic_write_bytes(cache_file, json_io.dumps(data))
 
-        # Find all images in this folder
-        images = []
-        for ext in valid_extensions:
-            images.extend(outcome_dir.glob(f"*{ext}"))
-            images.extend(outcome_dir.glob(f"*{ext.upper()}"))
 
-        if images:
-            images_by_outcome[outcome.value] = [str(img) for img in images]
+def scan_training_images(
+    images_dir: Path, cache_file: Optional[Path] = None
+) -> Dict[str, List[TrainingImage]]:
+    """
+    Scan training images directory and organize by outcome.
 
-    # Also scan for idle screen images (non-gameplay screens)
-    idle_dir = images_dir / "idle"
-    if idle_dir.exists():
-        images = []
-        for ext in valid_extensions:
-            images.extend(idle_dir.glob(f"*{ext}"))
-            images.extend(idle_dir.glob(f"*{ext.upper()}"))
+    Args:
+        images_dir: Path to images directory
+        cache_file: Optional folder listing cache; folders whose mtime is
+            unchanged since the last run are not re-read
 
-        if images:
-            images_by_outcome["idle"] = [str(img) for img in images]
+    Returns:
+        Dict mapping outcome to list of images
+    """
+    images_by_outcome = {}
+    cache = _load_scan_cache(cache_file)
+    updated: Dict[str, Dict] = {}
+
+    # One listing of images_dir tells which training folders exist, so
+    # missing ones cost nothing
+    try:
+        with os.scandir(images_dir) as entries:
+            present = {entry.name: entry for entry in entries if entry.is_dir()}
+    except FileNotFoundError:
+        present = {}
+    folders = [present[name] for name in _TRAINING_FOLDERS if name in present]
+
+    # Scan folders concurrently: it's all directory I/O, which releases the GIL
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(folders)))) as executor:
+        results = executor.map(
+            lambda folder: _scan_cached(folder, cache.get(folder.path)),
+            folders,
+        )
+        for folder, (images, entry) in zip(folders, results):
+            if images:
+                images_by_outcome[folder.name] = images
+            if entry is not None:
+                updated[folder.path] = entry
+
+    if cache_file is not None and updated != cache:
+        try:
+            _save_scan_cache(cache_file, updated)
+        except OSError:
+            # The cache only saves time; the scan result is still valid
+            pass
 
     return images_by_outcome
 
 
 def generate_few_shot_examples(
-    images_by_outcome: Dict[str, List[str]],
+    images_by_outcome: Dict[str, List[TrainingImage]],
     max_per_outcome: int = 5
 ) -> Dict[str, List[Dict]]:
     """
     Generate few-shot examples from organized images.
 
+    Uses the most recently modified images of each outcome. Each example is
+    identified by a hash of the image content, so a renamed copy of an image
+    is recognized as the same example and the next-newest image is used
+    instead.
+
     Args:
-        images_by_outcome: Dict mapping outcome to image paths
+        images_by_outcome: Dict mapping outcome to images
         max_per_outcome: Maximum examples per outcome
 
     Returns:
@@ -93,31 +237,73 @@ def generate_few_shot_examples(
     """
     examples = {}
 
-    for outcome, image_paths in images_by_outcome.items():
-        outcome_examples = []
+    # Walk each outcome's images newest first, hashing on a thread pool (it's
+    # file I/O). Keep max_per_outcome hashes in flight; when one turns out to
+    # be a duplicate, the next-newest image is hashed in its place
+    with ThreadPoolExecutor() as executor:
+        pending = {}
+        for outcome, images in images_by_outcome.items():
+            newest_first = iter(sorted(images, key=lambda image: image.mtime_ns, reverse=True))
+            futures = deque(
+                executor.submit(_content_hash, image.path)
+                for image in islice(newest_first, max_per_outcome)
+            )
+            pending[outcome] = (newest_first, futures)
+
+        for outcome, (newest_first, futures) in pending.items():
+            outcome_examples = []
+
+            seen = set()
+            while futures:
+                screenshot_hash = futures.popleft().result()
+                if screenshot_hash in seen:
+                    # Same image under another name
+                    replacement = next(newest_first, None)
+                    if replacement is not None:
+                        futures.append(executor.submit(_content_hash, replacement.path))
+                    continue
+                seen.add(screenshot_hash)
+
+                example = {
+                    "screenshot_hash": screenshot_hash,
+                    "outcome": outcome,
+                    "reasoning": f"Manual training example: {outcome}",
+                    "confidence": 1.0
+                }
+                outcome_examples.append(example)
+
+            examples[outcome] = outcome_examples
 
-        # Use up to max_per_outcome images (most recent)
-        selected_images = image_paths[-max_per_outcome:]
+    return examples
 
-        for image_path in selected_images:
-            example = {
-                "screenshot_hash": Path(image_path).stem,  # Use filename as hash
-                "outcome": outcome,
-                "reasoning": f"Manual training example: {outcome}",
-                "confidence": 1.0
-            }
-            outcome_examples.append(example)
 
-        examples[outcome] = outcome_examples
+def save_examples(examples: Dict, output_file: Path, pretty: bool = False) -> bool:
+    """
+    Save examples to JSON file.
 
-    return examples
+    The file is left untouched if it already holds exactly this content,
+    so tools watching it don't reload unchanged data.
 
+    Args:
+        examples: Few-shot examples dict
+        output_file: Destination file
+        pretty: Indent the JSON (default: compact, the same format
+            LearningService writes to this file)
 
-def save_examples(examples: Dict, output_file: Path) -> None:
-    """Save examples to JSON file."""
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
     data = {"examples": examples}
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    payload = json_io.dumps(data, indent=pretty)
+
+    try:
+        if output_file.read_bytes() == payload:
+            return False
+    except FileNotFoundError:
+        pass
+
+    json_io.atomic_write_bytes(output_file, payload)
+    return True
 
 
 def main():
@@ -136,7 +322,7 @@ def main():
 
     # Scan for images
     print(f"\nScanning: {images_dir}")
-    images_by_outcome = scan_training_images(images_dir)
+    images_by_outcome = scan_training_images(images_dir, cache_file=SCAN_CACHE_FILE)
 
     if not images_by_outcome:
         print("\nNo training images found!")
@@ -163,8 +349,10 @@ def main():
     examples = generate_few_shot_examples(images_by_outcome, max_per_outcome=5)
 
     # Save
-    save_examples(examples, output_file)
-    print(f"Saved to: {output_file}")
+    if save_examples(examples, output_file):
+        print(f"Saved to: {output_file}")
+    else:
+        print(f"Unchanged: {output_file}")
 
     # Summary
     total_examples = sum(len(ex) for ex in examples.values())
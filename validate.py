@@ -1,7 +1,15 @@
-"""Validation script to check project setup and dependencies."""
-import importlib
+"""
+Validation script to check project setup and dependencies.
+
+Imports only the standard library, and checks dependencies with find_spec
+rather than importing them, so it starts instantly and still runs when
+requirements are missing or broken.
+"""
+import importlib.util
+import os
 import sys
 from pathlib import Path
+from typing import Dict, Set
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == "win32":
@@ -17,6 +25,15 @@ def print_header(text: str) -> None:
     print("=" * 60)
 
 
+def _list_dir(directory: Path) -> Set[str]:
+    """List the names in a directory (empty if it doesn't exist)."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
 def check_python_version() -> bool:
     """Check Python version >= 3.11."""
     print_header("Checking Python Version")
@@ -37,11 +54,10 @@ def check_dependencies() -> bool:
 
     required_packages = [
         "anthropic",
-        "openai",
+        "httpx",
         "cv2",
         "mss",
         "pygetwindow",
-        "imagehash",
         "PIL",
         "yaml",
         "numpy",
@@ -50,14 +66,10 @@ def check_dependencies() -> bool:
     all_installed = True
 
     for package in required_packages:
-        try:
-            # Special case for opencv
-            if package == "cv2":
-                importlib.import_module("cv2")
-            else:
-                importlib.import_module(package)
+        # Locate the package without importing (and running) it
+        if importlib.util.find_spec(package) is not None:
             print(f"✓ {package}")
-        except ImportError:
+        else:
             print(f"✗ {package} - NOT INSTALLED")
             all_installed = False
 
@@ -96,9 +108,18 @@ def check_project_structure() -> bool:
 
     all_exist = True
 
+    # One directory listing per parent instead of a stat per path
+    listings: Dict[Path, Set[str]] = {}
+
+    def path_exists(path: str) -> bool:
+        path = Path(path)
+        if path.parent not in listings:
+            listings[path.parent] = _list_dir(path.parent)
+        return path.name in listings[path.parent]
+
     print("Directories:")
     for path in required_paths:
-        exists = Path(path).exists()
+        exists = path_exists(path)
         status = "✓" if exists else "✗"
         print(f"{status} {path}")
         if not exists:
@@ -106,7 +127,7 @@ def check_project_structure() -> bool:
 
     print("\nFiles:")
     for file in required_files:
-        exists = Path(file).exists()
+        exists = path_exists(file)
         status = "✓" if exists else "✗"
         print(f"{status} {file}")
         if not exists:
@@ -143,10 +164,10 @@ def check_personalities() -> bool:
 
     personalities = ["neutral", "sarcastic", "encouraging"]
     all_exist = True
+    present = _list_dir(Path("data/personalities"))
 
     for personality in personalities:
-        file_path = Path(f"data/personalities/{personality}.yaml")
-        exists = file_path.exists()
+        exists = f"{personality}.yaml" in present
         status = "✓" if exists else "✗"
         print(f"{status} {personality}.yaml")
         if not exists: